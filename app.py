@@ -11,427 +11,441 @@ NFL PickEm 2025/2026 - FINAL DEPLOYMENT VERSION
 ✅ GUARANTEED FUNCTIONALITY
 """
 
-from flask import Flask, request, jsonify, render_template, session
+from flask import (
+    Flask, Response, request, jsonify, render_template, session, g, has_request_context, stream_with_context
+)
+from werkzeug.http import quote_etag
 import sqlite3
 import os
-from datetime import datetime, timedelta
-import pytz
+import atexit
+import hashlib
+import queue
+import time
+from contextlib import closing
+from urllib.parse import urlencode
+from functools import lru_cache
+from datetime import datetime
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from assets import AssetManifest
+from compression import Compressor
+from database import ConnectionManager, file_lock
+from jsonprovider import FastJSONProvider
+from logconfig import configure_logging
+from metrics import CONTENT_TYPE, Metrics
+from migrations import check_query_plans, migrate
+from seed import seed_database
+from standings import rebuild_standings, refresh_user_standing
+from teams import TeamRegistry
+from users import find_user, login_choices, user_is_admin
+from data_version import DataVersions, RESULTS, PICKS, EVENTS
+from events import CLOSED, EventBroker, KEEPALIVE_INTERVAL, max_streams_from_env, publish_event
+from jobs import JobWorker, enqueue_jobs, job_status
+from queries import (
+    HISTORICAL_USAGE_SQL, LEADERBOARD_SQL, PENDING_GAMES_SQL, PICK_TARGET_SQL, RANK_SQL, SCORE_PICKS_SQL,
+    SCORE_STANDINGS_SQL, SCORED_COUNTS_SQL, SCORING_BATCH_SQL, TEAM_USAGE_SQL, USER_STANDING_SQL,
+    USER_WEEK_PICK_ID_SQL, USER_WEEK_PICK_SQL
+)
+from pick_history import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidQuery, decode_cursor, fetch_page, iter_picks, parse_filters
+)
+from schedule import WeekScheduleCache
+from scheduler import KickoffScheduler, lock_started_games
+from slowlog import slow_query_log_from_env
+from snapshot import ReadSnapshot, snapshot_enabled
+from eligibility import (
+    OpponentTable, blocked_teams, get_user_masks,
+    mask_to_team_ids, rebuild_team_eligibility, refresh_team_eligibility, team_bit
+)
+
+# Configure logging (JSON lines written by a listener thread, levels and sampling from the environment)
+log_listener = configure_logging()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'nfl_pickem_final_deployment')
+# orjson-backed jsonify (stdlib fallback)
+app.json = FastJSONProvider(app)
 
-# Database path
-DB_PATH = 'nfl_pickem.db'
-
-# Vienna timezone
-VIENNA_TZ = pytz.timezone('Europe/Vienna')
-
-# Valid users (no passwords needed)
-VALID_USERS = {
-    1: 'Manuel',
-    2: 'Daniel', 
-    3: 'Raff',
-    4: 'Haunschi'
-}
-
-# Admin users (can set results)
-ADMIN_USERS = {'Manuel'}
-
-# NFL Teams
-NFL_TEAMS = {
-    1: {'name': 'Arizona Cardinals', 'abbr': 'ARI'},
-    2: {'name': 'Atlanta Falcons', 'abbr': 'ATL'},
-    3: {'name': 'Baltimore Ravens', 'abbr': 'BAL'},
-    4: {'name': 'Buffalo Bills', 'abbr': 'BUF'},
-    5: {'name': 'Carolina Panthers', 'abbr': 'CAR'},
-    6: {'name': 'Chicago Bears', 'abbr': 'CHI'},
-    7: {'name': 'Cincinnati Bengals', 'abbr': 'CIN'},
-    8: {'name': 'Cleveland Browns', 'abbr': 'CLE'},
-    9: {'name': 'Dallas Cowboys', 'abbr': 'DAL'},
-    10: {'name': 'Denver Broncos', 'abbr': 'DEN'},
-    11: {'name': 'Detroit Lions', 'abbr': 'DET'},
-    12: {'name': 'Green Bay Packers', 'abbr': 'GB'},
-    13: {'name': 'Houston Texans', 'abbr': 'HOU'},
-    14: {'name': 'Indianapolis Colts', 'abbr': 'IND'},
-    15: {'name': 'Jacksonville Jaguars', 'abbr': 'JAX'},
-    16: {'name': 'Kansas City Chiefs', 'abbr': 'KC'},
-    17: {'name': 'Las Vegas Raiders', 'abbr': 'LV'},
-    18: {'name': 'Los Angeles Chargers', 'abbr': 'LAC'},
-    19: {'name': 'Los Angeles Rams', 'abbr': 'LAR'},
-    20: {'name': 'Miami Dolphins', 'abbr': 'MIA'},
-    21: {'name': 'Minnesota Vikings', 'abbr': 'MIN'},
-    22: {'name': 'New England Patriots', 'abbr': 'NE'},
-    23: {'name': 'New Orleans Saints', 'abbr': 'NO'},
-    24: {'name': 'New York Giants', 'abbr': 'NYG'},
-    25: {'name': 'New York Jets', 'abbr': 'NYJ'},
-    26: {'name': 'Philadelphia Eagles', 'abbr': 'PHI'},
-    27: {'name': 'Pittsburgh Steelers', 'abbr': 'PIT'},
-    28: {'name': 'San Francisco 49ers', 'abbr': 'SF'},
-    29: {'name': 'Seattle Seahawks', 'abbr': 'SEA'},
-    30: {'name': 'Tampa Bay Buccaneers', 'abbr': 'TB'},
-    31: {'name': 'Tennessee Titans', 'abbr': 'TEN'},
-    32: {'name': 'Washington Commanders', 'abbr': 'WAS'}
-}
+# CSS/JS of the page under content-hashed URLs ({{ asset_url('app.js') }} in templates)
+static_assets = AssetManifest(os.path.join(app.root_path, 'static'), ('app.css', 'app.js'))
+app.add_template_global(static_assets.url, 'asset_url')
 
-def update_all_pick_results_for_game(cursor, game_id, winner_team_id):
-    """🤖 FULL AUTOMATION: Update all pick results for a completed game"""
-    logger.info(f"🤖 AUTOMATION: Updating picks for game {game_id}, winner: {winner_team_id}")
+# Database path (overridable, e.g. for the benchmark leagues)
+DB_PATH = os.environ.get('DATABASE_PATH', 'nfl_pickem.db')
+
+# Per-route latency and SQL statement metrics of this worker (/metrics)
+metrics = Metrics()
+
+# Profiling mode (SLOW_QUERY_MS): statements over the threshold with their plans
+metrics.slow_log = slow_query_log_from_env(
+    context=lambda: f"{request.method} {request.path}" if has_request_context() else '(background)')
+
+# Pooled, pre-tuned connections (one per worker thread), timed for the metrics
+db_manager = ConnectionManager(DB_PATH, factory=metrics.connection_factory)
+atexit.register(db_manager.close_all)
+
+def get_db():
+    """Get the pooled connection for the current app context"""
+    if 'db' not in g:
+        g.db = db_manager.connection()
+    return g.db
+
+def get_read_db():
+    """Connection for read-only routes: the in-memory snapshot while it is current, else the pooled one"""
+    if 'read_db' not in g:
+        conn = None
+        if read_snapshot is not None:
+            conn = read_snapshot.connection(data_versions.get(RESULTS, PICKS))
+        g.read_db = conn if conn is not None else get_db()
+    return g.read_db
+
+@app.teardown_appcontext
+def release_db(exc):
+    g.pop('read_db', None)
+    conn = g.pop('db', None)
+    if conn is not None:
+        db_manager.release(conn)
+
+# Shared data versions behind the read API ETags (bumped after every committed write)
+data_versions = DataVersions(DB_PATH + '-version')
+
+# Bump when the JSON layout of a read API changes
+API_VERSION = 2
+
+def data_etag(name, *slots, extra=()):
+    """Strong ETag for a read API, derived from the given version counters"""
+    versions = data_versions.get(*slots) + tuple(extra)
+    return f"{name}-v{API_VERSION}-" + "-".join(str(v) for v in versions)
+
+def not_modified(etag):
+    """304 response if the client already holds this version, else None"""
+    # Weak comparison: compressed responses carry the ETag as W/"..."
+    if request.if_none_match.contains_weak(etag):
+        return with_etag(app.response_class(status=304), etag)
+    return None
+
+def with_etag(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def parse_int(value):
+    """Non-negative int from a JSON number or a string of digits, None for anything else"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value >= 0 else None
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    return None
+
+# Optional in-memory copy for the read routes (READ_SNAPSHOT=1); every write bumps RESULTS or PICKS
+read_snapshot = ReadSnapshot(DB_PATH, lambda: data_versions.get(RESULTS, PICKS),
+                             factory=metrics.connection_factory) if snapshot_enabled() else None
+
+# Fans live events out to this worker's /api/stream clients (at most SSE_MAX_STREAMS of them)
+event_broker = EventBroker(db_manager, data_versions, EVENTS, max_streams_from_env())
+
+# Per-week opponent masks for the team graying logic
+opponent_table = OpponentTable()
+
+# Prebuilt per-week game lists for /api/matches
+schedule_cache = WeekScheduleCache()
+
+# gzip/brotli for text responses, compressed bodies cached by ETag
+compressor = Compressor()
+
+def score_picks_for_games(cursor, winners):
+    """🤖 FULL AUTOMATION: Score all picks of completed games in one set-based pass.
+
+    winners maps match_id -> winner_team_id. Standings are adjusted by the
+    delta between the new result and whatever was stored before (NULL = not
+    yet scored), then every affected pick is re-scored with a single UPDATE.
+    Returns {match_id: picks_updated}.
+    """
+    cursor.execute(SCORING_BATCH_SQL)
+    cursor.execute("DELETE FROM temp.scoring_batch")
+    cursor.executemany("""
+        INSERT INTO temp.scoring_batch (match_id, winner_team_id)
+        SELECT id, ? FROM matches WHERE id = ?
+    """, [(winner_team_id, match_id) for match_id, winner_team_id in winners.items()])
     
-    cursor.execute("""
-        SELECT p.id, p.user_id, p.team_id, u.username, t.name
-        FROM picks p
-        JOIN users u ON p.user_id = u.id
-        JOIN teams t ON p.team_id = t.id
-        WHERE p.match_id = ?
-    """, (game_id,))
+    # Standings delta must be taken BEFORE the picks are re-scored
+    cursor.execute(SCORE_STANDINGS_SQL)
+    cursor.execute(SCORE_PICKS_SQL)
     
-    picks = cursor.fetchall()
-    updates_made = 0
+    cursor.execute(SCORED_COUNTS_SQL)
+    picks_updated = dict(cursor.fetchall())
+    cursor.execute("DELETE FROM temp.scoring_batch")
     
-    for pick_id, user_id, picked_team_id, username, team_name in picks:
-        is_correct = (picked_team_id == winner_team_id)
+    logger.info("✅ AUTOMATION: Updated %s user picks for %s games", sum(picks_updated.values()), len(winners))
+    return {match_id: picks_updated.get(match_id, 0) for match_id in winners}
+
+def update_all_pick_results_for_game(cursor, game_id, winner_team_id):
+    """🤖 FULL AUTOMATION: Update all pick results for a completed game"""
+    logger.debug("🤖 AUTOMATION: Updating picks for game %s, winner: %s", game_id, winner_team_id)
+    return score_picks_for_games(cursor, {game_id: winner_team_id})[game_id]
+
+def load_games(cursor, match_ids):
+    """Load (home_team_id, away_team_id, home_name, away_name) for the given games"""
+    placeholders = ", ".join("?" * len(match_ids))
+    cursor.execute(f"""
+        SELECT id, home_team_id, away_team_id FROM matches WHERE id IN ({placeholders})
+    """, list(match_ids))
+    games = {}
+    for match_id, home_id, away_id in cursor.fetchall():
+        home, away = team_registry.get(home_id), team_registry.get(away_id)
+        if home is not None and away is not None:
+            games[match_id] = (home_id, away_id, home.name, away.name)
+    return games
+
+def record_game_results(cursor, username, games, results):
+    """Store final scores, log the admin actions and queue the pick scoring.
+
+    games comes from load_games(); results is a list of
+    (match_id, home_score, away_score). Everything runs on the caller's
+    cursor so it commits as one transaction; the score_game jobs run after
+    the commit on the job worker. Returns one summary per game.
+    """
+    summaries = []
+    for match_id, home_score, away_score in results:
+        home_team_id, away_team_id, home_team_name, away_team_name = games[match_id]
         
-        cursor.execute("UPDATE picks SET is_correct = ? WHERE id = ?", (is_correct, pick_id))
+        # Determine winner
+        if home_score > away_score:
+            winner_team_id, winner_name = home_team_id, home_team_name
+        elif away_score > home_score:
+            winner_team_id, winner_name = away_team_id, away_team_name
+        else:
+            winner_team_id, winner_name = None, "Tie"
         
-        logger.info(f"   👤 {username} picked {team_name}: {'✅ CORRECT' if is_correct else '❌ WRONG'}")
-        updates_made += 1
-    
-    logger.info(f"✅ AUTOMATION: Updated {updates_made} user picks")
-    return updates_made
-
-def init_database():
-    """Initialize database with EXACT historical data and static games"""
-    print("🏈 Initializing database...")
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Create tables
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            username TEXT UNIQUE NOT NULL
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS teams (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            abbreviation TEXT NOT NULL,
-            logo_url TEXT
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS matches (
-            id INTEGER PRIMARY KEY,
-            week INTEGER NOT NULL,
-            home_team_id INTEGER NOT NULL,
-            away_team_id INTEGER NOT NULL,
-            game_time TEXT NOT NULL,
-            is_completed BOOLEAN DEFAULT FALSE,
-            home_score INTEGER,
-            away_score INTEGER,
-            winner_team_id INTEGER
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS picks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            match_id INTEGER NOT NULL,
-            team_id INTEGER NOT NULL,
-            week INTEGER NOT NULL,
-            created_at TEXT NOT NULL,
-            is_correct BOOLEAN
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS historical_picks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            week INTEGER NOT NULL,
-            team_name TEXT NOT NULL,
-            team_id INTEGER,
-            is_correct BOOLEAN NOT NULL,
-            created_at TEXT NOT NULL
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS team_usage (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            team_id INTEGER NOT NULL,
-            usage_type TEXT NOT NULL,
-            week INTEGER NOT NULL,
-            created_at TEXT NOT NULL
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS admin_actions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            admin_user TEXT NOT NULL,
-            action_type TEXT NOT NULL,
-            match_id INTEGER,
-            details TEXT,
-            created_at TEXT NOT NULL
-        )
-    """)
-    
-    # Insert users
-    for user_id, username in VALID_USERS.items():
-        cursor.execute("INSERT OR REPLACE INTO users (id, username) VALUES (?, ?)", (user_id, username))
-    
-    # Insert teams
-    for team_id, team_data in NFL_TEAMS.items():
-        cursor.execute("""
-            INSERT OR REPLACE INTO teams (id, name, abbreviation, logo_url) 
-            VALUES (?, ?, ?, ?)
-        """, (
-            team_id, 
-            team_data['name'], 
-            team_data['abbr'],
-            f"https://a.espncdn.com/i/teamlogos/nfl/500/{team_data['abbr'].lower()}.png"
-        ))
+        summaries.append({
+            'match_id': match_id,
+            'home_score': home_score,
+            'away_score': away_score,
+            'winner_team_id': winner_team_id,
+            'winner': winner_name,
+            'result': f"{away_team_name} {away_score} - {home_score} {home_team_name}"
+        })
     
-    # Insert EXACT historical data as specified
-    historical_data = [
-        # Manuel: W1 Falcons (lost), W2 Cowboys (won) = 1 point
-        (1, 1, 'Atlanta Falcons', 2, False, '2025-09-08T19:00:00'),
-        (1, 2, 'Dallas Cowboys', 9, True, '2025-09-15T19:00:00'),
-        
-        # Daniel: W1 Broncos (won), W2 Eagles (won) = 2 points  
-        (2, 1, 'Denver Broncos', 10, True, '2025-09-08T19:00:00'),
-        (2, 2, 'Philadelphia Eagles', 26, True, '2025-09-15T19:00:00'),
-        
-        # Raff: W1 Bengals (won), W2 Cowboys (won) = 2 points
-        (3, 1, 'Cincinnati Bengals', 7, True, '2025-09-08T19:00:00'),
-        (3, 2, 'Dallas Cowboys', 9, True, '2025-09-15T19:00:00'),
-        
-        # Haunschi: W1 Commanders (won), W2 Bills (won) = 2 points
-        (4, 1, 'Washington Commanders', 32, True, '2025-09-08T19:00:00'),
-        (4, 2, 'Buffalo Bills', 4, True, '2025-09-15T19:00:00')
-    ]
+    # Update match results
+    cursor.executemany("""
+        UPDATE matches 
+        SET is_completed = 1, home_score = ?, away_score = ?, winner_team_id = ?
+        WHERE id = ?
+    """, [(s['home_score'], s['away_score'], s['winner_team_id'], s['match_id']) for s in summaries])
     
-    for user_id, week, team_name, team_id, is_correct, created_at in historical_data:
-        cursor.execute("""
-            INSERT OR REPLACE INTO historical_picks (user_id, week, team_name, team_id, is_correct, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (user_id, week, team_name, team_id, is_correct, created_at))
+    # Log admin actions
+    now = datetime.now().isoformat()
+    cursor.executemany("""
+        INSERT INTO admin_actions (admin_user, action_type, match_id, details, created_at)
+        VALUES (?, 'set_result', ?, ?, ?)
+    """, [(username, s['match_id'], f"{s['result']}, Winner: {s['winner']}", now) for s in summaries])
     
-    # Insert team usage based on CORRECT win/loss results
-    team_usage_data = [
-        # Manuel: W1 Falcons (LOST) = loser, W2 Cowboys (WON) = winner
-        (1, 2, 'loser', 1, '2025-09-08T19:00:00'),    # Manuel: Falcons W1 (LOST)
-        (1, 9, 'winner', 2, '2025-09-15T19:00:00'),   # Manuel: Cowboys W2 (WON)
-        
-        # Daniel: W1 Broncos (WON) = winner, W2 Eagles (WON) = winner  
-        (2, 10, 'winner', 1, '2025-09-08T19:00:00'),  # Daniel: Broncos W1 (WON)
-        (2, 26, 'winner', 2, '2025-09-15T19:00:00'),  # Daniel: Eagles W2 (WON)
-        
-        # Raff: W1 Bengals (WON) = winner, W2 Cowboys (WON) = winner
-        (3, 7, 'winner', 1, '2025-09-08T19:00:00'),   # Raff: Bengals W1 (WON)
-        (3, 9, 'winner', 2, '2025-09-15T19:00:00'),   # Raff: Cowboys W2 (WON)
-        
-        # Haunschi: W1 Commanders (WON) = winner, W2 Bills (WON) = winner
-        (4, 32, 'winner', 1, '2025-09-08T19:00:00'),  # Haunschi: Commanders W1 (WON)
-        (4, 4, 'winner', 2, '2025-09-15T19:00:00')    # Haunschi: Bills W2 (WON)
-    ]
-    
-    for user_id, team_id, usage_type, week, created_at in team_usage_data:
-        cursor.execute("""
-            INSERT OR REPLACE INTO team_usage (user_id, team_id, usage_type, week, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user_id, team_id, usage_type, week, created_at))
+    # Live events: one per result; standings follow once the picks are scored
+    for s in summaries:
+        publish_event(cursor, 'result', {
+            'match_id': s['match_id'],
+            'home_score': s['home_score'],
+            'away_score': s['away_score'],
+            'winner_team_id': s['winner_team_id']
+        })
     
-    # Create static games for all weeks W1-W18
-    create_static_games_all_weeks(cursor)
+    # 🤖 TRIGGER FULL AUTOMATION in the background (ties leave picks unscored)
+    job_ids = enqueue_jobs(cursor, 'score_game', [{'match_id': s['match_id']} for s in summaries])
+    for summary, job_id in zip(summaries, job_ids):
+        summary['job_id'] = job_id
     
-    conn.commit()
-    conn.close()
-    print("✅ Database initialized!")
+    return summaries
 
-def create_static_games_all_weeks(cursor):
-    """Create real NFL 2025 games for all 18 weeks - OFFICIAL SCHEDULE"""
-    print("🏈 Creating REAL NFL 2025 games for all 18 weeks...")
+def score_game_jobs(cursor, payloads):
+    """🤖 Job handler: score every pick of games whose result was recorded.
+
+    The winner is read from the match at processing time, so a corrected
+    result queued twice scores the final one. Returns one result per job.
+    """
+    match_ids = sorted({payload['match_id'] for payload in payloads})
+    placeholders = ", ".join("?" * len(match_ids))
+    cursor.execute(f"""
+        SELECT id, winner_team_id FROM matches
+        WHERE id IN ({placeholders}) AND winner_team_id IS NOT NULL
+    """, match_ids)
+    winners = dict(cursor.fetchall())
     
-    # Real NFL 2025 matchups from operations.nfl.com
-    # Team name to ID mapping
-    team_name_to_id = {
-        'Dallas Cowboys': 9, 'Philadelphia Eagles': 26, 'Kansas City Chiefs': 16, 'Los Angeles Chargers': 18,
-        'Tampa Bay Buccaneers': 30, 'Atlanta Falcons': 2, 'Cincinnati Bengals': 7, 'Cleveland Browns': 8,
-        'Miami Dolphins': 20, 'Indianapolis Colts': 14, 'Carolina Panthers': 5, 'Jacksonville Jaguars': 15,
-        'Las Vegas Raiders': 17, 'New England Patriots': 22, 'Arizona Cardinals': 1, 'New Orleans Saints': 23,
-        'Pittsburgh Steelers': 27, 'New York Jets': 25, 'New York Giants': 24, 'Washington Commanders': 32,
-        'Tennessee Titans': 31, 'Denver Broncos': 10, 'San Francisco 49ers': 28, 'Seattle Seahawks': 29,
-        'Detroit Lions': 11, 'Green Bay Packers': 12, 'Houston Texans': 13, 'Los Angeles Rams': 19,
-        'Baltimore Ravens': 3, 'Buffalo Bills': 4, 'Minnesota Vikings': 21, 'Chicago Bears': 6
-    }
+    picks_updated = score_picks_for_games(cursor, winners) if winners else {}
     
-    # Real NFL 2025 schedule by week (away @ home format)
-    real_schedule = {
-        1: [  # Week 1 - Thursday Sept 4, 2025
-            ('Dallas Cowboys', 'Philadelphia Eagles'),
-            ('Kansas City Chiefs', 'Los Angeles Chargers'),  # Sao Paulo
-            ('Tampa Bay Buccaneers', 'Atlanta Falcons'),
-            ('Cincinnati Bengals', 'Cleveland Browns'),
-            ('Miami Dolphins', 'Indianapolis Colts'),
-            ('Carolina Panthers', 'Jacksonville Jaguars'),
-            ('Las Vegas Raiders', 'New England Patriots'),
-            ('Arizona Cardinals', 'New Orleans Saints'),
-            ('Pittsburgh Steelers', 'New York Jets'),
-            ('New York Giants', 'Washington Commanders'),
-            ('Tennessee Titans', 'Denver Broncos'),
-            ('San Francisco 49ers', 'Seattle Seahawks'),
-            ('Detroit Lions', 'Green Bay Packers'),
-            ('Houston Texans', 'Los Angeles Rams'),
-            ('Baltimore Ravens', 'Buffalo Bills'),
-            ('Minnesota Vikings', 'Chicago Bears')
-        ],
-        2: [  # Week 2
-            ('Cleveland Browns', 'Baltimore Ravens'),
-            ('Jacksonville Jaguars', 'Cincinnati Bengals'),
-            ('New York Giants', 'Dallas Cowboys'),
-            ('Chicago Bears', 'Detroit Lions'),
-            ('New England Patriots', 'Miami Dolphins'),
-            ('San Francisco 49ers', 'New Orleans Saints'),
-            ('Buffalo Bills', 'New York Jets'),
-            ('Seattle Seahawks', 'Pittsburgh Steelers'),
-            ('Los Angeles Rams', 'Tennessee Titans'),
-            ('Carolina Panthers', 'Arizona Cardinals'),
-            ('Denver Broncos', 'Indianapolis Colts'),
-            ('Philadelphia Eagles', 'Kansas City Chiefs'),
-            ('Atlanta Falcons', 'Minnesota Vikings'),
-            ('Tampa Bay Buccaneers', 'Houston Texans'),
-            ('Los Angeles Chargers', 'Las Vegas Raiders'),
-            ('Washington Commanders', 'Green Bay Packers')
-        ],
-        3: [  # Week 3
-            ('Dallas Cowboys', 'Chicago Bears'),
-            ('Arizona Cardinals', 'San Francisco 49ers'),
-            ('Kansas City Chiefs', 'New York Giants'),
-            ('Detroit Lions', 'Baltimore Ravens'),
-            ('Cleveland Browns', 'New York Jets'),
-            ('New England Patriots', 'Tampa Bay Buccaneers'),
-            ('Arizona Cardinals', 'Seattle Seahawks'),
-            ('Los Angeles Rams', 'San Francisco 49ers'),
-            ('Detroit Lions', 'Washington Commanders'),
-            ('Pittsburgh Steelers', 'Los Angeles Chargers'),
-            ('Philadelphia Eagles', 'Green Bay Packers'),
-            ('Miami Dolphins', 'Buffalo Bills'),
-            ('Houston Texans', 'Jacksonville Jaguars'),
-            ('Carolina Panthers', 'Las Vegas Raiders'),
-            ('Tennessee Titans', 'Indianapolis Colts'),
-            ('Minnesota Vikings', 'New Orleans Saints')
+    # New standings of everyone affected
+    if winners:
+        placeholders = ", ".join("?" * len(winners))
+        cursor.execute(f"""
+            SELECT s.user_id, u.username, s.points, s.picks
+            FROM standings s
+            JOIN users u ON s.user_id = u.id
+            WHERE s.user_id IN (SELECT user_id FROM picks WHERE match_id IN ({placeholders}))
+        """, list(winners))
+        changed = [
+            {'user_id': user_id, 'username': name, 'points': points, 'picks': picks}
+            for user_id, name, points, picks in cursor.fetchall()
         ]
-        # Continue with more weeks as needed...
-    }
+        if changed:
+            publish_event(cursor, 'standings', {'standings': changed})
     
-    # For now, create games for weeks 1-3 with real data, then generate remaining weeks
-    game_id = 1
-    
-    for week in range(1, 19):
-        if week in real_schedule:
-            # Use real schedule
-            matchups = real_schedule[week]
+    return [{'picks_updated': picks_updated.get(payload['match_id'], 0)} for payload in payloads]
+
+# Background jobs (pick scoring) of this worker process
+def bump_after_job(job_type):
+    data_versions.bump(RESULTS, EVENTS)
+
+job_worker = JobWorker(db_manager, {'score_game': score_game_jobs}, after_commit=bump_after_job)
+
+# Locks games at kickoff (every worker runs one; locking is idempotent)
+def after_kickoff_lock(locked):
+    data_versions.bump(RESULTS, EVENTS)
+    schedule_cache.invalidate()
+
+kickoff_scheduler = KickoffScheduler(db_manager, after_lock=after_kickoff_lock)
+
+@app.before_request
+def start_request_metrics():
+    metrics.start_request()
+
+@app.after_request
+def record_request_metrics(response):
+    # The rule, not the path, so query strings and ids do not explode the label set
+    route = request.url_rule.rule if request.url_rule is not None else '(unmatched)'
+    metrics.finish_request(request.method, route, response.status_code)
+    return response
+
+@app.after_request
+def compress_response(response):
+    return compressor.apply(request, response)
+
+@app.before_request
+def take_turns():
+    # Under the gevent workers (monkey-patched sleep) a keep-alive client whose next
+    # request is already buffered would be served again without a switch; let the
+    # other connections go first. With threads this only releases the GIL.
+    time.sleep(0)
+
+@app.before_request
+def start_background_threads():
+    # Also picks up jobs left over from before a restart
+    job_worker.ensure_started()
+    kickoff_scheduler.ensure_started()
+    if read_snapshot is not None:
+        read_snapshot.ensure_started()
+
+def init_database():
+    """Bring the schema up to date and seed a fresh database with EXACT historical data and static games"""
+    print("🏈 Initializing database...")
+    # Workers booting at the same time (no preload, several instances) take turns;
+    # the first one migrates and seeds, the others find nothing left to do
+    with file_lock(DB_PATH + '-init.lock'):
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        
+        # Create or upgrade tables (versioned migrations, also converts legacy layouts)
+        applied = migrate(conn)
+        for version, name in applied:
+            print(f"✅ Migration {version}: {name}")
+        
+        cursor.execute("SELECT COUNT(*) FROM users")
+        fresh = cursor.fetchone()[0] == 0
+        
+        if fresh:
+            # Users, teams, EXACT historical data and the full static schedule
+            seed_database(cursor)
         else:
-            # Generate placeholder matchups for remaining weeks
-            matchups = [
-                ('Dallas Cowboys', 'New York Giants'),
-                ('Kansas City Chiefs', 'Denver Broncos'),
-                ('Buffalo Bills', 'Miami Dolphins'),
-                ('Baltimore Ravens', 'Pittsburgh Steelers'),
-                ('Green Bay Packers', 'Chicago Bears'),
-                ('San Francisco 49ers', 'Los Angeles Rams'),
-                ('Philadelphia Eagles', 'Washington Commanders'),
-                ('New England Patriots', 'New York Jets'),
-                ('Tampa Bay Buccaneers', 'Carolina Panthers'),
-                ('Atlanta Falcons', 'New Orleans Saints'),
-                ('Cincinnati Bengals', 'Cleveland Browns'),
-                ('Detroit Lions', 'Minnesota Vikings'),
-                ('Houston Texans', 'Indianapolis Colts'),
-                ('Jacksonville Jaguars', 'Tennessee Titans'),
-                ('Las Vegas Raiders', 'Los Angeles Chargers'),
-                ('Arizona Cardinals', 'Seattle Seahawks')
-            ]
-        
-        for i, (away_team, home_team) in enumerate(matchups):
-            away_id = team_name_to_id.get(away_team, 1)
-            home_id = team_name_to_id.get(home_team, 2)
-            
-            # Calculate game time in Vienna timezone
-            from datetime import datetime, timedelta
-            import pytz
-            
-            VIENNA_TZ = pytz.timezone('Europe/Vienna')
-            base_date = datetime(2025, 9, 4) + timedelta(weeks=week-1)  # Sept 4, 2025 start
-            
-            # Distribute games across Thu/Sun/Mon
-            if i == 0:  # Thursday Night Football
-                game_time = base_date + timedelta(days=0, hours=21, minutes=15)  # 21:15 Vienna
-            elif i < 13:  # Sunday games
-                game_time = base_date + timedelta(days=3, hours=19 + (i % 3), minutes=0)  # Sunday various times
-            else:  # Monday Night Football
-                game_time = base_date + timedelta(days=4, hours=21, minutes=15)  # Monday 21:15 Vienna
-            
-            vienna_time = VIENNA_TZ.localize(game_time)
-            
+            # Teams are reference data every layout needs (legacy databases have none)
+            seed_database(cursor, tables=('teams',))
+        
+        if applied and not fresh:
+            # Legacy historical picks only carried a team id
             cursor.execute("""
-                INSERT OR REPLACE INTO matches (id, week, home_team_id, away_team_id, game_time, is_completed)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (game_id, week, home_id, away_id, vienna_time.isoformat(), week <= 2))
-            
-            game_id += 1
-    
-    print("✅ REAL NFL 2025 games created for all 18 weeks")
+                UPDATE historical_picks
+                SET team_name = COALESCE((SELECT name FROM teams WHERE teams.id = historical_picks.team_id), '')
+                WHERE team_name = ''
+            """)
+        
+        if fresh or applied:
+            rebuild_standings(cursor)
+            rebuild_team_eligibility(cursor)
+        
+        # Close games that kicked off while no worker was running (no clients to notify yet)
+        locked = lock_started_games(cursor)
+        
+        conn.commit()
+        conn.close()
+        
+        if fresh or applied:
+            data_versions.reset()
+            opponent_table.invalidate()
+            schedule_cache.invalidate()
+        elif locked:
+            # Same as a lock by the scheduler: clients revalidate the affected games
+            after_kickoff_lock(locked)
+    print("✅ Database initialized!")
+
+# Initialize (or migrate) database on startup
+init_database()
 
-# Initialize database on startup
-if not os.path.exists(DB_PATH):
-    init_database()
+# Teams never change at runtime: ids are resolved here instead of JOINing `teams`
+with closing(sqlite3.connect(DB_PATH)) as _conn:
+    team_registry = TeamRegistry.load(_conn.cursor())
 
 @app.route('/')
 def index():
-    if 'user_id' not in session:
-        return render_template('index.html', logged_in=False, valid_users=list(VALID_USERS.values()))
-    
-    is_admin = session.get('username') in ADMIN_USERS
-    return render_template('index.html', logged_in=True, username=session['username'], is_admin=is_admin)
+    # Small leagues pick their name from a list, big ones type it; nothing else on the page varies
+    valid_users = login_choices(get_read_db().cursor())
+    html, etag = render_shell(tuple(valid_users) if valid_users is not None else None)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    return with_etag(app.response_class(html, mimetype='text/html'), etag)
+
+@lru_cache(maxsize=8)
+def render_shell(valid_users):
+    """The page (markup only, CSS/JS are fingerprinted assets) and its content ETag, rendered once"""
+    html = render_template('index.html', valid_users=valid_users)
+    return html, f"shell-{hashlib.sha1(html.encode()).hexdigest()[:16]}"
+
+@app.route('/assets/<filename>')
+def get_asset(filename):
+    """Fingerprinted CSS/JS: a URL never changes content, so browsers keep it for good"""
+    asset = static_assets.get(filename)
+    if asset is None:
+        return jsonify({'success': False, 'message': 'Datei nicht gefunden'}), 404
+    etag = f"asset-{asset.digest}"
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(asset.body, mimetype=asset.mimetype)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
 @app.route('/api/login', methods=['POST'])
 def login():
     try:
-        data = request.get_json()
-        username = data.get('username')
+        data = request.get_json(silent=True)
+        username = data.get('username') if isinstance(data, dict) else None
         
-        if not username:
+        if not username or not isinstance(username, str):
             return jsonify({'success': False, 'message': 'Benutzername erforderlich'}), 400
         
-        user_id = None
-        for uid, uname in VALID_USERS.items():
-            if uname == username:
-                user_id = uid
-                break
+        user = find_user(get_db().cursor(), username.strip())
         
-        if user_id:
+        if user:
+            user_id, username, is_admin = user
             session['user_id'] = user_id
             session['username'] = username
-            is_admin = username in ADMIN_USERS
+            is_admin = bool(is_admin)
             return jsonify({'success': True, 'message': f'Willkommen, {username}!', 'is_admin': is_admin})
         else:
             return jsonify({'success': False, 'message': 'Ungültiger Benutzername'}), 401
             
     except Exception as e:
-        logger.error(f"Login error: {e}")
+        logger.error("Login error: %s", e)
         return jsonify({'success': False, 'message': 'Server-Fehler beim Login'}), 500
 
 @app.route('/api/logout', methods=['POST'])
@@ -439,6 +453,48 @@ def logout():
     session.clear()
     return jsonify({'success': True, 'message': 'Erfolgreich abgemeldet'})
 
+def dashboard_etag(user_id):
+    return data_etag('dashboard', RESULTS, data_versions.user_slot(user_id), extra=(user_id,))
+
+def dashboard_payload(cursor, user_id):
+    """Body of /api/dashboard"""
+    # Get points and scored picks from the materialized standings
+    cursor.execute(USER_STANDING_SQL, (user_id,))
+    total_points, total_picks = cursor.fetchone() or (0, 0)
+    
+    # Get team usage from both historical picks and current picks (names from the team registry)
+    # First get from historical picks
+    cursor.execute(HISTORICAL_USAGE_SQL, (user_id,))
+    historical_usage = cursor.fetchall()
+    
+    # Then get from team_usage table
+    cursor.execute(TEAM_USAGE_SQL, (user_id,))
+    current_usage = cursor.fetchall()
+    
+    # Combine both
+    team_usage = [(team_registry.name(team_id), usage_type)
+                  for team_id, usage_type in historical_usage + current_usage
+                  if team_registry.get(team_id) is not None]
+    
+    winner_teams = [row[0] for row in team_usage if row[1] == 'winner']
+    loser_teams = [row[0] for row in team_usage if row[1] == 'loser']
+    
+    # Calculate rank (same ordering as the leaderboard)
+    cursor.execute(RANK_SQL, {'points': total_points, 'picks': total_picks, 'user_id': user_id})
+    rank = cursor.fetchone()[0]
+    
+    return {
+        'success': True,
+        'current_week': 3,
+        'picks_submitted': 1 if total_picks > 0 else 0,
+        'total_points': total_points,
+        'correct_picks': total_points,
+        'total_picks': total_picks,
+        'rank': rank,
+        'winner_teams': winner_teams,
+        'loser_teams': loser_teams
+    }
+
 @app.route('/api/dashboard')
 def dashboard():
     """Dashboard API with EXACT historical data + live picks"""
@@ -447,349 +503,262 @@ def dashboard():
             return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
         
         user_id = session['user_id']
+        etag = dashboard_etag(user_id)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
         
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Get historical picks
-        cursor.execute("SELECT is_correct FROM historical_picks WHERE user_id = ?", (user_id,))
-        historical_picks = cursor.fetchall()
-        historical_points = sum(1 for pick in historical_picks if pick[0])
-        
-        # Get current season picks
-        cursor.execute("SELECT is_correct FROM picks WHERE user_id = ? AND is_correct IS NOT NULL", (user_id,))
-        current_picks = cursor.fetchall()
-        current_points = sum(1 for pick in current_picks if pick[0])
-        
-        total_points = historical_points + current_points
-        total_picks = len(historical_picks) + len(current_picks)
-        
-        # Get team usage
-                # Get team usage from both historical picks and current picks
-        # First get from historical picks
-        cursor.execute("""
-            SELECT t.name, 
-                   CASE WHEN hp.is_correct = 1 THEN 'winner' ELSE 'loser' END as usage_type
-            FROM historical_picks hp 
-            JOIN teams t ON hp.team_id = t.id 
-            WHERE hp.user_id = ?
-        """, (user_id,))
-        historical_usage = cursor.fetchall()
-        
-        # Then get from team_usage table
-        cursor.execute("""
-            SELECT t.name, tu.usage_type 
-            FROM team_usage tu 
-            JOIN teams t ON tu.team_id = t.id 
-            WHERE tu.user_id = ?
-        """, (user_id,))
-        current_usage = cursor.fetchall()
-        
-        # Combine both
-        team_usage = historical_usage + current_usage
-                
-        
-        winner_teams = [row[0] for row in team_usage if row[1] == 'winner']
-        loser_teams = [row[0] for row in team_usage if row[1] == 'loser']
-        
-        # Calculate rank
-        cursor.execute("""
-            SELECT u.id, u.username, 
-                   (COUNT(CASE WHEN hp.is_correct = 1 THEN 1 END) + 
-                    COUNT(CASE WHEN p.is_correct = 1 THEN 1 END)) as total_points
-            FROM users u
-            LEFT JOIN historical_picks hp ON u.id = hp.user_id
-            LEFT JOIN picks p ON u.id = p.user_id AND p.is_correct IS NOT NULL
-            GROUP BY u.id, u.username
-            ORDER BY total_points DESC
-        """)
-        rankings = cursor.fetchall()
-        
-        rank = 1
-        for i, (uid, uname, points) in enumerate(rankings):
-            if uid == user_id:
-                rank = i + 1
-                break
-        
-        conn.close()
-        
-        return jsonify({
-            'success': True,
-            'current_week': 3,
-            'picks_submitted': 1 if total_picks > 0 else 0,
-            'total_points': total_points,
-            'correct_picks': total_points,
-            'total_picks': total_picks,
-            'rank': rank,
-            'winner_teams': winner_teams,
-            'loser_teams': loser_teams
-        })
+        return with_etag(jsonify(dashboard_payload(get_read_db().cursor(), user_id)), etag)
         
     except Exception as e:
-        logger.error(f"Dashboard error: {e}")
+        logger.error("Dashboard error: %s", e)
         return jsonify({'success': False, 'message': 'Fehler beim Laden des Dashboards'}), 500
 
+def leaderboard_etag():
+    return data_etag('leaderboard', RESULTS)
+
+def leaderboard_payload(cursor):
+    """Body of /api/leaderboard"""
+    cursor.execute(LEADERBOARD_SQL)
+    
+    leaderboard_data = []
+    for i, (username, total_picks, points) in enumerate(cursor.fetchall()):
+        leaderboard_data.append({
+            'rank': i + 1,
+            'username': username,
+            'points': points,
+            'total_picks': total_picks,
+            'correct_picks': points
+        })
+    
+    return {'success': True, 'leaderboard': leaderboard_data}
+
 @app.route('/api/leaderboard')
 def leaderboard():
     """Leaderboard API"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT u.username, 
-                   (COUNT(hp.id) + COUNT(p.id)) as total_picks,
-                   (COUNT(CASE WHEN hp.is_correct = 1 THEN 1 END) + 
-                    COUNT(CASE WHEN p.is_correct = 1 THEN 1 END)) as points
-            FROM users u
-            LEFT JOIN historical_picks hp ON u.id = hp.user_id
-            LEFT JOIN picks p ON u.id = p.user_id AND p.is_correct IS NOT NULL
-            GROUP BY u.id, u.username
-            ORDER BY points DESC, total_picks ASC
-        """)
-        
-        leaderboard_data = []
-        for i, (username, total_picks, points) in enumerate(cursor.fetchall()):
-            leaderboard_data.append({
-                'rank': i + 1,
-                'username': username,
-                'points': points,
-                'total_picks': total_picks,
-                'correct_picks': points
-            })
+        etag = leaderboard_etag()
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
         
-        conn.close()
-        
-        return jsonify({'success': True, 'leaderboard': leaderboard_data})
+        return with_etag(jsonify(leaderboard_payload(get_read_db().cursor())), etag)
         
     except Exception as e:
-        logger.error(f"Leaderboard error: {e}")
+        logger.error("Leaderboard error: %s", e)
         return jsonify({'success': False, 'message': 'Fehler beim Laden des Leaderboards'}), 500
 
 @app.route('/api/all-picks')
 def all_picks():
-    """All picks API"""
+    """All picks API: keyset-paginated by (week, username), filterable, optionally streamed as NDJSON"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        limit = request.args.get('limit', type=int)
+        
+        if request.args.get('format') != 'ndjson':
+            # Same filters in any order or encoding share one ETag; sha1 so no two queries collide.
+            # Checked before the query is parsed, so a revalidation never touches the database.
+            query = urlencode(sorted(request.args.items(multi=True)))
+            etag = data_etag('all-picks', RESULTS, PICKS, extra=(hashlib.sha1(query.encode()).hexdigest(),))
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
+        
+        conn = get_read_db()
         cursor = conn.cursor()
+        after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        conditions, params = parse_filters(cursor, team_registry, request.args)
         
-        # Get historical picks
-        cursor.execute("""
-            SELECT u.username, hp.week, hp.team_name, 
-                   CASE WHEN hp.is_correct = 1 THEN 'Correct' ELSE 'Incorrect' END as result,
-                   hp.created_at
-            FROM historical_picks hp
-            JOIN users u ON hp.user_id = u.id
-            ORDER BY hp.week, u.username
-        """)
-        
-        all_picks_data = []
-        for row in cursor.fetchall():
-            all_picks_data.append({
-                'user': row[0],
-                'week': row[1],
-                'team': row[2],
-                'result': row[3],
-                'created_at': row[4]
-            })
-        
-        # Get current picks
-        cursor.execute("""
-            SELECT u.username, p.week, t.name,
-                   CASE 
-                       WHEN p.is_correct IS NULL THEN 'Pending'
-                       WHEN p.is_correct = 1 THEN 'Correct' 
-                       ELSE 'Incorrect' 
-                   END as result,
-                   p.created_at
-            FROM picks p
-            JOIN users u ON p.user_id = u.id
-            JOIN teams t ON p.team_id = t.id
-            ORDER BY p.week, u.username
-        """)
-        
-        for row in cursor.fetchall():
-            all_picks_data.append({
-                'user': row[0],
-                'week': row[1],
-                'team': row[2],
-                'result': row[3],
-                'created_at': row[4]
-            })
+        if request.args.get('format') == 'ndjson':
+            # Streamed straight from the SQLite cursor, chunk by chunk
+            def generate():
+                for pick in iter_picks(cursor, team_registry, conditions, params, after, limit):
+                    yield app.json.dumps(pick) + "\n"
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
         
-        all_picks_data.sort(key=lambda x: (x['week'], x['user']))
+        limit = min(max(limit or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+        picks, next_cursor = fetch_page(cursor, team_registry, conditions, params, after, limit)
         
-        conn.close()
-        
-        return jsonify({'success': True, 'picks': all_picks_data})
+        return with_etag(jsonify({'success': True, 'picks': picks, 'next_cursor': next_cursor}), etag)
         
+    except InvalidQuery as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        logger.error(f"All picks error: {e}")
+        logger.error("All picks error: %s", e)
         return jsonify({'success': False, 'message': 'Fehler beim Laden aller Picks'}), 500
 
+def available_weeks_etag():
+    return data_etag('available-weeks', RESULTS)
+
+def available_weeks_payload():
+    """Body of /api/available-weeks"""
+    weeks_info = []
+    for week in range(1, 19):
+        status = 'completed' if week <= 2 else 'active' if week == 3 else 'upcoming'
+        weeks_info.append({
+            'week': week,
+            'status': status,
+            'games_count': 16,
+            'completed_games': 16 if week <= 2 else 0
+        })
+    
+    return {
+        'success': True,
+        'weeks': weeks_info,
+        'current_week': 3
+    }
+
 @app.route('/api/available-weeks')
 def available_weeks():
     """Get all available weeks W1-W18"""
     try:
-        weeks_info = []
-        for week in range(1, 19):
-            status = 'completed' if week <= 2 else 'active' if week == 3 else 'upcoming'
-            weeks_info.append({
-                'week': week,
-                'status': status,
-                'games_count': 16,
-                'completed_games': 16 if week <= 2 else 0
-            })
+        etag = available_weeks_etag()
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
         
-        return jsonify({
-            'success': True,
-            'weeks': weeks_info,
-            'current_week': 3
-        })
+        return with_etag(jsonify(available_weeks_payload()), etag)
         
     except Exception as e:
-        logger.error(f"Available weeks error: {e}")
+        logger.error("Available weeks error: %s", e)
         return jsonify({'success': False, 'message': 'Fehler beim Laden der verfügbaren Wochen'}), 500
 
+@app.route('/api/teams')
+def get_teams():
+    """All teams - reference data for the compact match payloads.
+
+    Teams never change while the app runs: /api/teams?v=<teams_version> is
+    cached by browsers and proxies for good, the bare URL for an hour.
+    """
+    etag = f"teams-v{API_VERSION}-{team_registry.version}"
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify({'success': True, 'version': team_registry.version, 'teams': team_registry.as_dicts()})
+    response.set_etag(etag)
+    if request.args.get('v') == team_registry.version:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+def matches_etag(user_id, week, compact):
+    return data_etag('matches', RESULTS, data_versions.user_slot(user_id), extra=(user_id, week, int(compact)))
+
+def matches_payload(cursor, user_id, week, compact):
+    """Body of /api/matches (success False when the week has no games)"""
+    # Shared game list of the week (built once per results version)
+    matches_data = schedule_cache.get(cursor, week, data_versions.get(RESULTS), team_registry, compact)
+    
+    if not matches_data:
+        return {'success': False, 'message': f'Keine Spiele für Woche {week} gefunden'}
+    
+    # Get user picks for this week
+    cursor.execute(USER_WEEK_PICK_SQL, (user_id, week))
+    picks_data = {row[0]: row[1] for row in cursor.fetchall()}
+    
+    # Calculate unpickable teams with ADVANCED LOGIC from the precomputed masks:
+    # losers, teams used 2x as winners and opponents of loser teams this week
+    loser_mask, winner_twice_mask = get_user_masks(cursor, user_id)
+    unpickable_mask, unpickable_reasons = blocked_teams(
+        loser_mask, winner_twice_mask, opponent_table.for_week(cursor, week, data_versions.get()))
+    unpickable_teams = mask_to_team_ids(unpickable_mask)
+    
+    # Hot path: lazy arguments, sampled with LOG_SAMPLE
+    logger.debug("Matches for week %s, user %s: %s games, %s teams blocked", week, user_id,
+                 len(matches_data), len(unpickable_teams),
+                 extra={'week': week, 'user_id': user_id, 'blocked': len(unpickable_teams)})
+    
+    payload = {
+        'success': True,
+        'matches': matches_data,
+        'picks': picks_data,
+        'unpickable_teams': unpickable_teams,
+        'unpickable_reasons': unpickable_reasons
+    }
+    if compact:
+        payload['week'] = week
+        payload['teams_version'] = team_registry.version
+    return payload
+
 @app.route('/api/matches')
 def get_matches():
-    """Get matches for a specific week - STATIC VERSION (NO ESPN ERRORS)"""
+    """Get matches for a specific week - STATIC VERSION (NO ESPN ERRORS)
+
+    ?compact=1 references teams by id (see /api/teams) instead of embedding them.
+    """
     try:
         if 'user_id' not in session:
             return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
 
         user_id = session['user_id']
         week = request.args.get('week', type=int, default=3)
+        compact = request.args.get('compact') in ('1', 'true')
+        etag = matches_etag(user_id, week, compact)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
 
-        logger.info(f"Loading matches for week {week}, user {user_id}")
+        payload = matches_payload(get_read_db().cursor(), user_id, week, compact)
+        if not payload['success']:
+            return jsonify(payload)
+        return with_etag(jsonify(payload), etag)
 
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Get matches for the week
-        cursor.execute("""
-            SELECT m.id, m.week, m.home_team_id, m.away_team_id, m.game_time, m.is_completed,
-                   m.home_score, m.away_score,
-                   ht.name as home_name, ht.abbreviation as home_abbr,
-                   at.name as away_name, at.abbreviation as away_abbr
-            FROM matches m
-            JOIN teams ht ON m.home_team_id = ht.id
-            JOIN teams at ON m.away_team_id = at.id
-            WHERE m.week = ?
-            ORDER BY m.game_time
-        """, (week,))
-        
-        matches_raw = cursor.fetchall()
-        logger.info(f"Found {len(matches_raw)} matches for week {week}")
-        
-        if not matches_raw:
-            conn.close()
-            return jsonify({'success': False, 'message': f'Keine Spiele für Woche {week} gefunden'})
-        
-        matches_data = []
-        for row in matches_raw:
-            try:
-                # Convert game time to Vienna timezone
-                game_time = datetime.fromisoformat(row[4])
-                if game_time.tzinfo is None:
-                    game_time = VIENNA_TZ.localize(game_time)
-                else:
-                    game_time = game_time.astimezone(VIENNA_TZ)
-                
-                matches_data.append({
-                    'id': row[0],
-                    'week': row[1],
-                    'home_team': {
-                        'id': row[2], 
-                        'name': row[8], 
-                        'abbr': row[9],
-                        'logo_url': f"https://a.espncdn.com/i/teamlogos/nfl/500/{row[9].lower()}.png"
-                    },
-                    'away_team': {
-                        'id': row[3], 
-                        'name': row[10], 
-                        'abbr': row[11],
-                        'logo_url': f"https://a.espncdn.com/i/teamlogos/nfl/500/{row[11].lower()}.png"
-                    },
-                    'game_time': game_time.isoformat(),
-                    'is_completed': bool(row[5]),
-                    'home_score': row[6],
-                    'away_score': row[7]
-                })
-            except Exception as e:
-                logger.error(f"Error processing match {row[0]}: {e}")
-                continue
-        
-        # Get user picks for this week
-        cursor.execute("SELECT match_id, team_id FROM picks WHERE user_id = ? AND week = ?", (user_id, week))
-        picks_data = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Get team usage for graying logic
-        cursor.execute("SELECT team_id, usage_type FROM team_usage WHERE user_id = ?", (user_id,))
-        team_usage = cursor.fetchall()
-        
-                # Calculate unpickable teams with ADVANCED LOGIC
-        
-        # Get all loser teams for this user
-        cursor.execute("SELECT team_id FROM team_usage WHERE user_id = ? AND usage_type = 'loser'", (user_id,))
-        loser_team_ids = {row[0] for row in cursor.fetchall()}
+    except Exception as e:
+        logger.error("Error getting matches for week %s: %s", week, e)
+        return jsonify({'success': False, 'message': f'Fehler beim Laden der Spiele: {str(e)}'}), 500
+
+def bootstrap_section(url, etag, payload):
+    """A bootstrap part: the same body and ETag a request to `url` would get"""
+    return {'url': url, 'etag': quote_etag(etag) if payload['success'] else None, 'data': payload}
+
+@app.route('/api/bootstrap')
+def bootstrap():
+    """🚀 Initial page state in one round trip: dashboard, weeks, this week's games and the leaderboard.
+
+    Everything is read in one transaction, so the parts agree with each other.
+    Every part carries the ETag of its own API, so the page revalidates them
+    separately afterwards (304s instead of full reloads).
+    """
+    try:
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
         
-        # Get teams used 2+ times as winners
-        cursor.execute("""
-            SELECT team_id, COUNT(*) as usage_count 
-            FROM team_usage 
-            WHERE user_id = ? AND usage_type = 'winner' 
-            GROUP BY team_id 
-            HAVING COUNT(*) >= 2
-        """, (user_id,))
-        overused_winner_ids = {row[0] for row in cursor.fetchall()}
-        
-        # Get opponents of loser teams for current week
-        opponent_blocked_ids = set()
-        for match in matches_raw:
-            match_id, match_week, home_id, away_id = match[0], match[1], match[2], match[3]
-            if match_week == week:
-                # If home team is a loser team, away team cannot be picked as winner
-                if home_id in loser_team_ids:
-                    opponent_blocked_ids.add(away_id)
-                # If away team is a loser team, home team cannot be picked as winner  
-                if away_id in loser_team_ids:
-                    opponent_blocked_ids.add(home_id)
-        
-        # Combine all unpickable teams
-        unpickable_teams = loser_team_ids | overused_winner_ids | opponent_blocked_ids
-        
-        # Create detailed reasons for frontend
-        unpickable_reasons = {}
-        for team_id in unpickable_teams:
-            reasons = []
-            if team_id in loser_team_ids:
-                reasons.append("Als Verlierer verwendet")
-            if team_id in overused_winner_ids:
-                reasons.append("2x als Gewinner verwendet")
-            if team_id in opponent_blocked_ids:
-                reasons.append("Gegner eines Verlierer-Teams")
-            unpickable_reasons[team_id] = " & ".join(reasons)
-        
-        logger.info(f"Week {week} unpickable teams for user {user_id}: {len(unpickable_teams)} teams blocked")
-        logger.info(f"  Loser teams: {len(loser_team_ids)}")
-        logger.info(f"  Overused winners: {len(overused_winner_ids)}")
-        logger.info(f"  Opponent blocked: {len(opponent_blocked_ids)}")
-        conn.close()
+        user_id = session['user_id']
+        weeks = available_weeks_payload()
+        week = weeks['current_week']
+        etag = data_etag('bootstrap', RESULTS, data_versions.user_slot(user_id), extra=(user_id, week))
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
         
-        logger.info(f"Successfully returning {len(matches_data)} matches for week {week}")
+        # Versions before data, like the single routes: a tag is never newer than its body
+        etags = (dashboard_etag(user_id), available_weeks_etag(), matches_etag(user_id, week, True), leaderboard_etag())
         
-        return jsonify({
+        conn = get_read_db()
+        cursor = conn.cursor()
+        # One read transaction instead of four requests on four connections
+        cursor.execute("BEGIN")
+        try:
+            dashboard_data = dashboard_payload(cursor, user_id)
+            matches_data = matches_payload(cursor, user_id, week, compact=True)
+            leaderboard_data = leaderboard_payload(cursor)
+        finally:
+            conn.rollback()
+        
+        return with_etag(jsonify({
             'success': True,
-            'matches': matches_data,
-            'picks': picks_data,
-            'unpickable_teams': list(unpickable_teams),
-            'unpickable_reasons': unpickable_reasons
-        })
-
+            'week': week,
+            'sections': {
+                'dashboard': bootstrap_section('/api/dashboard', etags[0], dashboard_data),
+                'available_weeks': bootstrap_section('/api/available-weeks', etags[1], weeks),
+                'matches': bootstrap_section(f'/api/matches?week={week}&compact=1', etags[2], matches_data),
+                'leaderboard': bootstrap_section('/api/leaderboard', etags[3], leaderboard_data)
+            }
+        }), etag)
+        
     except Exception as e:
-        logger.error(f"Error getting matches for week {week}: {e}")
-        return jsonify({'success': False, 'message': f'Fehler beim Laden der Spiele: {str(e)}'}), 500
+        logger.error("Bootstrap error: %s", e)
+        return jsonify({'success': False, 'message': 'Fehler beim Laden der Startdaten'}), 500
 
 @app.route('/api/picks', methods=['POST'])
 def save_pick():
@@ -798,51 +767,52 @@ def save_pick():
         if 'user_id' not in session:
             return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
 
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'message': 'Fehlende Daten für die Auswahl'}), 400
         user_id = session['user_id']
-        match_id = data.get('match_id')
-        team_id = data.get('team_id')
-        week = data.get('week')
+        match_id = parse_int(data.get('match_id'))
+        team_id = parse_int(data.get('team_id'))
+        week = parse_int(data.get('week'))
 
         if not all([match_id, team_id, week]):
             return jsonify({'success': False, 'message': 'Fehlende Daten für die Auswahl'}), 400
 
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
+        # Take the write lock before validating: a concurrent save of the same user and week
+        # waits for this one instead of both inserting (UNIQUE) or checking stale usage.
+        # Early returns leave the transaction to release_db, which rolls it back.
+        cursor.execute("BEGIN IMMEDIATE")
         
-        # Check if game has started
-        cursor.execute("SELECT game_time FROM matches WHERE id = ?", (match_id,))
+        # Check if game is locked; the kickoff itself covers the instant before the scheduler ticks
+        cursor.execute(PICK_TARGET_SQL, (int(time.time()), match_id))
         result = cursor.fetchone()
         if not result:
-            conn.close()
             return jsonify({'success': False, 'message': 'Spiel nicht gefunden'}), 404
-            
-        game_time_str = result[0]
-        game_time = datetime.fromisoformat(game_time_str)
-        if game_time.tzinfo is None:
-            game_time = VIENNA_TZ.localize(game_time)
         
-        if datetime.now(VIENNA_TZ) > game_time:
-            conn.close()
+        started, match_week, home_team_id, away_team_id = result
+        # Only the two teams of the game, and only in the game's own week
+        if team_id not in (home_team_id, away_team_id):
+            return jsonify({'success': False, 'message': 'Team spielt nicht in diesem Spiel'}), 400
+        
+        if week != match_week:
+            return jsonify({'success': False, 'message': 'Spiel gehört nicht zu dieser Woche'}), 400
+        
+        if started:
             return jsonify({'success': False, 'message': 'Das Spiel hat bereits begonnen'}), 403
 
-        # Check team usage limits
-        cursor.execute("SELECT usage_type FROM team_usage WHERE user_id = ? AND team_id = ?", (user_id, team_id))
-        usage_records = cursor.fetchall()
-        
-        loser_usage = any(record[0] == 'loser' for record in usage_records)
-        winner_usage_count = sum(1 for record in usage_records if record[0] == 'winner')
+        # Check team usage limits against the user's eligibility masks
+        loser_mask, winner_twice_mask = get_user_masks(cursor, user_id)
         
-        if loser_usage:
-            conn.close()
+        if loser_mask & team_bit(team_id):
             return jsonify({'success': False, 'message': 'Team bereits als Verlierer verwendet'}), 400
         
-        if winner_usage_count >= 2:
-            conn.close()
+        if winner_twice_mask & team_bit(team_id):
             return jsonify({'success': False, 'message': 'Team bereits 2x als Gewinner verwendet'}), 400
 
         # Save or update pick
-        cursor.execute("SELECT id FROM picks WHERE user_id = ? AND week = ?", (user_id, week))
+        cursor.execute(USER_WEEK_PICK_ID_SQL, (user_id, week))
         existing_pick = cursor.fetchone()
         
         if existing_pick:
@@ -863,15 +833,67 @@ def save_pick():
             VALUES (?, ?, 'winner', ?, ?)
         """, (user_id, team_id, week, datetime.now().isoformat()))
         
+        # Keep the materialized standings and eligibility masks in sync within the same transaction
+        refresh_user_standing(cursor, user_id)
+        refresh_team_eligibility(cursor, user_id)
+        publish_event(cursor, 'pick', {'user_id': user_id, 'username': session.get('username'), 'week': week})
+        
         conn.commit()
-        conn.close()
+        data_versions.bump(PICKS, EVENTS, data_versions.user_slot(user_id))
         
         return jsonify({'success': True, 'message': 'Pick erfolgreich gespeichert'})
 
     except Exception as e:
-        logger.error(f"Error saving pick: {e}")
+        logger.error("Error saving pick: %s", e)
         return jsonify({'success': False, 'message': 'Fehler beim Speichern des Picks'}), 500
 
+@app.route('/api/stream')
+def event_stream():
+    """Server-Sent Events: live results, standings changes and pick locks"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    subscriber = event_broker.subscribe()
+    if subscriber is None:
+        # Every stream slot of this worker is taken: the page polls with ETags instead
+        response = jsonify({'success': False, 'message': 'Zu viele Live-Verbindungen'})
+        response.headers['Retry-After'] = '300'
+        return response, 503
+    missed = event_broker.replay(last_event_id) if last_event_id is not None else []
+    # The stream itself only waits on its queue: no database connection stays open per tab
+    db_manager.disconnect()
+    
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            for frame in missed:
+                yield frame
+            while True:
+                try:
+                    frame = subscriber.get(timeout=KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                # Dropped as too slow: end the response, the browser reconnects with Last-Event-ID
+                if frame is CLOSED:
+                    return
+                yield frame
+        finally:
+            event_broker.unsubscribe(subscriber)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def parse_result(entry):
+    """(match_id, home_score, away_score) from a result object, None if it is not valid"""
+    if not isinstance(entry, dict):
+        return None
+    result = tuple(parse_int(entry.get(key)) for key in ('match_id', 'home_score', 'away_score'))
+    return None if None in result else result
+
 @app.route('/api/admin/set-result', methods=['POST'])
 def set_game_result():
     """🚀 ADMIN: Set game result - TRIGGERS FULL AUTOMATION"""
@@ -880,85 +902,176 @@ def set_game_result():
             return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
         
         username = session.get('username')
-        if username not in ADMIN_USERS:
+        if not user_is_admin(get_db().cursor(), session['user_id']):
             return jsonify({'success': False, 'message': 'Keine Admin-Berechtigung'}), 403
         
-        data = request.get_json()
-        match_id = data.get('match_id')
-        home_score = data.get('home_score')
-        away_score = data.get('away_score')
+        result = parse_result(request.get_json(silent=True))
+        if result is None:
+            return jsonify({'success': False, 'message': 'Fehlende oder ungültige Daten'}), 400
+        match_id, home_score, away_score = result
         
-        if not all([match_id is not None, home_score is not None, away_score is not None]):
-            return jsonify({'success': False, 'message': 'Fehlende Daten'}), 400
-        
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
         
         # Get game info
-        cursor.execute("""
-            SELECT home_team_id, away_team_id, ht.name, at.name, week
-            FROM matches m
-            JOIN teams ht ON m.home_team_id = ht.id
-            JOIN teams at ON m.away_team_id = at.id
-            WHERE m.id = ?
-        """, (match_id,))
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
+        games = load_games(cursor, [match_id])
+        if match_id not in games:
             return jsonify({'success': False, 'message': 'Spiel nicht gefunden'}), 404
         
-        home_team_id, away_team_id, home_team_name, away_team_name, week = result
+        summary = record_game_results(cursor, username, games, [(match_id, home_score, away_score)])[0]
+        conn.commit()
+        data_versions.bump(RESULTS, EVENTS)
+        schedule_cache.invalidate()
+        job_worker.wake()
         
-        # Determine winner
-        if home_score > away_score:
-            winner_team_id = home_team_id
-            winner_name = home_team_name
-        elif away_score > home_score:
-            winner_team_id = away_team_id
-            winner_name = away_team_name
-        else:
-            winner_team_id = None
-            winner_name = "Tie"
+        logger.info("🎯 ADMIN ACTION: %s set result for game %s: %s, winner %s, scoring job %s",
+                    username, match_id, summary['result'], summary['winner'], summary['job_id'])
         
-        # Update match result
-        cursor.execute("""
-            UPDATE matches 
-            SET is_completed = 1, home_score = ?, away_score = ?, winner_team_id = ?
-            WHERE id = ?
-        """, (home_score, away_score, winner_team_id, match_id))
+        return jsonify({
+            'success': True, 
+            'message': f"Ergebnis gesetzt: {summary['result']}",
+            'winner': summary['winner'],
+            'job_id': summary['job_id'],
+            'automation_complete': False
+        })
         
-        # 🤖 TRIGGER FULL AUTOMATION
-        picks_updated = 0
-        if winner_team_id:
-            picks_updated = update_all_pick_results_for_game(cursor, match_id, winner_team_id)
+    except Exception as e:
+        logger.error("Error setting game result: %s", e)
+        return jsonify({'success': False, 'message': 'Fehler beim Setzen des Ergebnisses'}), 500
+
+@app.route('/api/admin/set-results', methods=['POST'])
+def set_game_results():
+    """🚀 ADMIN: Set a whole batch of game results in one transaction"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
         
-        # Log admin action
-        cursor.execute("""
-            INSERT INTO admin_actions (admin_user, action_type, match_id, details, created_at)
-            VALUES (?, 'set_result', ?, ?, ?)
-        """, (username, match_id, 
-              f"{away_team_name} {away_score} - {home_score} {home_team_name}, Winner: {winner_name}",
-              datetime.now().isoformat()))
+        username = session.get('username')
+        if not user_is_admin(get_db().cursor(), session['user_id']):
+            return jsonify({'success': False, 'message': 'Keine Admin-Berechtigung'}), 403
+        
+        data = request.get_json(silent=True)
+        entries = data.get('results') if isinstance(data, dict) else None
+        if not entries or not isinstance(entries, list):
+            return jsonify({'success': False, 'message': 'Fehlende Daten'}), 400
+        
+        # Every entry an object with integer ids and scores, or nothing is stored
+        results = [parse_result(entry) for entry in entries]
+        if None in results:
+            return jsonify({'success': False, 'message': 'Fehlende oder ungültige Daten'}), 400
+        
+        match_ids = [match_id for match_id, _, _ in results]
+        if len(set(match_ids)) != len(match_ids):
+            return jsonify({'success': False, 'message': 'Spiel mehrfach angegeben'}), 400
         
+        conn = get_db()
+        cursor = conn.cursor()
+        
+        games = load_games(cursor, match_ids)
+        missing = [match_id for match_id in match_ids if match_id not in games]
+        if missing:
+            return jsonify({'success': False, 'message': 'Spiel nicht gefunden', 'missing': missing}), 404
+        
+        summaries = record_game_results(cursor, username, games, results)
         conn.commit()
-        conn.close()
+        data_versions.bump(RESULTS, EVENTS)
+        schedule_cache.invalidate()
+        job_worker.wake()
         
-        logger.info(f"🎯 ADMIN ACTION: {username} set result for game {match_id}")
-        logger.info(f"   📊 Result: {away_team_name} {away_score} - {home_score} {home_team_name}")
-        logger.info(f"   🏆 Winner: {winner_name}")
-        logger.info(f"   🤖 Automation: {picks_updated} picks updated")
+        logger.info("🎯 ADMIN ACTION: %s set %s results, scoring queued", username, len(summaries))
         
         return jsonify({
-            'success': True, 
-            'message': f'Ergebnis gesetzt: {away_team_name} {away_score} - {home_score} {home_team_name}',
-            'winner': winner_name,
-            'picks_updated': picks_updated,
-            'automation_complete': True
+            'success': True,
+            'message': f'{len(summaries)} Ergebnisse gesetzt',
+            'results': [
+                {'match_id': s['match_id'], 'result': s['result'], 'winner': s['winner'],
+                 'job_id': s['job_id']}
+                for s in summaries
+            ],
+            'automation_complete': False
         })
         
     except Exception as e:
-        logger.error(f"Error setting game result: {e}")
-        return jsonify({'success': False, 'message': 'Fehler beim Setzen des Ergebnisses'}), 500
+        logger.error("Error setting game results: %s", e)
+        return jsonify({'success': False, 'message': 'Fehler beim Setzen der Ergebnisse'}), 500
+
+@app.route('/api/admin/jobs')
+def get_job_status():
+    """Background job progress: queue depth, lag and the latest jobs"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
+        
+        cursor = get_db().cursor()
+        if not user_is_admin(cursor, session['user_id']):
+            return jsonify({'success': False, 'message': 'Keine Admin-Berechtigung'}), 403
+        
+        recent = min(request.args.get('limit', type=int, default=20), 200)
+        status = job_status(cursor, recent=recent)
+        return jsonify({'success': True, 'worker_alive': job_worker.is_alive(), **status})
+        
+    except Exception as e:
+        logger.error("Job status error: %s", e)
+        return jsonify({'success': False, 'message': 'Fehler beim Laden der Jobs'}), 500
+
+@app.route('/api/admin/cache')
+def get_cache_stats():
+    """Hit/miss counters of this worker's in-process caches and the read snapshot's refresh cost"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
+        
+        if not user_is_admin(get_db().cursor(), session['user_id']):
+            return jsonify({'success': False, 'message': 'Keine Admin-Berechtigung'}), 403
+        
+        return jsonify({
+            'success': True,
+            'pid': os.getpid(),
+            'db_connections': db_manager.open_connections(),
+            'streams': event_broker.stats(),
+            'schedule': schedule_cache.stats(),
+            'compression': compressor.stats(),
+            'snapshot': read_snapshot.stats() if read_snapshot is not None else None
+        })
+        
+    except Exception as e:
+        logger.error("Cache stats error: %s", e)
+        return jsonify({'success': False, 'message': 'Fehler beim Laden der Cache-Statistik'}), 500
+
+@app.route('/api/admin/slow-queries')
+def get_slow_queries():
+    """Slow statements of this worker with their query plans, plus the plans of the hot queries"""
+    try:
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
+        
+        conn = get_db()
+        if not user_is_admin(conn.cursor(), session['user_id']):
+            return jsonify({'success': False, 'message': 'Keine Admin-Berechtigung'}), 403
+        
+        hot_queries = [
+            {'name': name, 'plan': plan, 'uses_index': uses_index}
+            for name, plan, uses_index in check_query_plans(conn)
+        ]
+        slow_log = metrics.slow_log
+        if slow_log is None:
+            return jsonify({'success': True, 'enabled': False, 'hot_queries': hot_queries})
+        
+        limit = min(request.args.get('limit', type=int, default=50), 200)
+        return jsonify({
+            'success': True,
+            'enabled': True,
+            'pid': os.getpid(),
+            'threshold_ms': slow_log.threshold_ms,
+            'log_file': slow_log.path,
+            'shapes': slow_log.shapes(),
+            'recent': slow_log.recent(limit),
+            'hot_queries': hot_queries
+        })
+        
+    except Exception as e:
+        logger.error("Slow query log error: %s", e)
+        return jsonify({'success': False, 'message': 'Fehler beim Laden der langsamen Abfragen'}), 500
 
 @app.route('/api/admin/pending-games')
 def get_pending_games():
@@ -968,53 +1081,41 @@ def get_pending_games():
             return jsonify({'success': False, 'message': 'Nicht angemeldet'}), 401
         
         username = session.get('username')
-        if username not in ADMIN_USERS:
+        if not user_is_admin(get_db().cursor(), session['user_id']):
             return jsonify({'success': False, 'message': 'Keine Admin-Berechtigung'}), 403
         
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_db()
         cursor = conn.cursor()
         
-        # Get incomplete games from current and past weeks
-        cursor.execute("""
-            SELECT m.id, m.week, m.game_time, m.is_completed,
-                   ht.name as home_name, ht.abbreviation as home_abbr,
-                   at.name as away_name, at.abbreviation as away_abbr
-            FROM matches m
-            JOIN teams ht ON m.home_team_id = ht.id
-            JOIN teams at ON m.away_team_id = at.id
-            WHERE m.is_completed = 0 AND m.week <= 4
-            ORDER BY m.week, m.game_time
-        """)
+        # Games that have kicked off but have no result yet
+        cursor.execute(PENDING_GAMES_SQL, (int(time.time()),))
         
         pending_games = []
         for row in cursor.fetchall():
-            try:
-                game_time = datetime.fromisoformat(row[2])
-                if game_time.tzinfo is None:
-                    game_time = VIENNA_TZ.localize(game_time)
-                else:
-                    game_time = game_time.astimezone(VIENNA_TZ)
-                
-                pending_games.append({
-                    'id': row[0],
-                    'week': row[1],
-                    'game_time': game_time.isoformat(),
-                    'home_team': {'name': row[4], 'abbr': row[5]},
-                    'away_team': {'name': row[6], 'abbr': row[7]},
-                    'display': f"W{row[1]}: {row[6]} @ {row[4]}"
-                })
-            except Exception as e:
-                logger.error(f"Error processing pending game {row[0]}: {e}")
+            home, away = team_registry.get(row[3]), team_registry.get(row[4])
+            if home is None or away is None:
                 continue
+            pending_games.append({
+                'id': row[0],
+                'week': row[1],
+                'game_time': row[2],
+                'home_team': {'name': home.name, 'abbr': home.abbr},
+                'away_team': {'name': away.name, 'abbr': away.abbr},
+                'display': f"W{row[1]}: {away.name} @ {home.name}"
+            })
         
-        conn.close()
         
         return jsonify({'success': True, 'pending_games': pending_games})
         
     except Exception as e:
-        logger.error(f"Error getting pending games: {e}")
+        logger.error("Error getting pending games: %s", e)
         return jsonify({'success': False, 'message': 'Fehler beim Laden der ausstehenden Spiele'}), 500
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request latency, status codes and SQL statement counts of this worker (Prometheus text format)"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
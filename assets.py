@@ -0,0 +1,48 @@
+"""
+Fingerprinted static assets for NFL PickEm
+The page's CSS and JS live in static/ and are served under names that carry
+a hash of their content (app.css -> /assets/app.3f2a9c1d7e4b.css). A changed
+file gets a new URL, so browsers may cache every URL for good and only the
+small HTML shell is ever revalidated. Files are read and hashed once at
+startup; changing them needs a restart, like the templates.
+"""
+
+import hashlib
+import mimetypes
+import os
+from typing import NamedTuple
+
+URL_PREFIX = '/assets/'
+
+
+class Asset(NamedTuple):
+    name: str
+    filename: str
+    digest: str
+    mimetype: str
+    body: bytes
+
+
+class AssetManifest:
+    """Logical name -> fingerprinted asset, for the files in `directory`"""
+
+    def __init__(self, directory, names):
+        self._by_name = {}
+        self._by_filename = {}
+        for name in names:
+            with open(os.path.join(directory, name), 'rb') as f:
+                body = f.read()
+            digest = hashlib.sha256(body).hexdigest()[:12]
+            stem, ext = os.path.splitext(name)
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            asset = Asset(name, f"{stem}.{digest}{ext}", digest, mimetype, body)
+            self._by_name[name] = asset
+            self._by_filename[asset.filename] = asset
+
+    def url(self, name):
+        """URL of the current version of a file (used by the templates)"""
+        return URL_PREFIX + self._by_name[name].filename
+
+    def get(self, filename):
+        """Asset for a fingerprinted file name, None for unknown or outdated names"""
+        return self._by_filename.get(filename)
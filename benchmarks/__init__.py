@@ -0,0 +1,11 @@
+"""
+Micro-benchmarks for the NFL PickEm API hot paths
+Builds synthetic leagues, drives the Flask app through its test client and
+records latency percentiles, queries per request and allocations per
+endpoint. Results are written to benchmarks/baseline.json, so re-running the
+suite shows regressions as a plain git diff.
+
+    python -m benchmarks                        # all league sizes, rewrite baseline.json
+    python -m benchmarks --sizes 4,100          # only some league sizes
+    python -m benchmarks --output /tmp/run.json # keep the committed baseline untouched
+"""
@@ -0,0 +1,99 @@
+"""
+Synthetic leagues for the benchmarks
+The real season schedule from seed_data.json with weeks 1-17 played and
+week 18 still open (kickoffs moved into the future so picks can be saved).
+Every user has made a valid pick in each played week.
+"""
+
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from eligibility import rebuild_team_eligibility, team_bit
+from migrations import migrate
+from schedule import store_kickoffs
+from seed import seed_database
+from standings import rebuild_standings
+
+PLAYED_WEEKS = 17
+OPEN_WEEK = 18
+
+
+def _play_schedule(cursor, rng):
+    """Give every game of the played weeks a final score; returns {week: [(match_id, home, away, winner)]}"""
+    cursor.execute("SELECT id, week, home_team_id, away_team_id FROM matches ORDER BY id")
+    games_by_week, results = {}, []
+    for match_id, week, home_id, away_id in cursor.fetchall():
+        if week > PLAYED_WEEKS:
+            continue
+        home_score, away_score = rng.randint(3, 42), rng.randint(3, 42)
+        if home_score == away_score:
+            home_score += 3
+        winner_id = home_id if home_score > away_score else away_id
+        results.append((home_score, away_score, winner_id, match_id))
+        games_by_week.setdefault(week, []).append((match_id, home_id, away_id, winner_id))
+
+    cursor.executemany("""
+        UPDATE matches SET is_completed = 1, home_score = ?, away_score = ?, winner_team_id = ?
+        WHERE id = ?
+    """, results)
+
+    kickoff = (datetime.now().astimezone() + timedelta(days=30)).replace(microsecond=0).isoformat()
+    cursor.execute("SELECT id FROM matches WHERE week = ?", (OPEN_WEEK,))
+    store_kickoffs(cursor, [(match_id, kickoff) for match_id, in cursor.fetchall()])
+    return games_by_week
+
+
+def _make_picks(user_ids, games_by_week, rng):
+    """One pick per user and played week that never reuses a loser or a twice-won team"""
+    picks, usage = [], []
+    for user_id in user_ids:
+        loser_mask = winner_mask = winner_twice_mask = 0
+        for week in range(1, PLAYED_WEEKS + 1):
+            candidates = [
+                (match_id, team_id, team_id == winner_id)
+                for match_id, home_id, away_id, winner_id in games_by_week[week]
+                for team_id in (home_id, away_id)
+                if not (loser_mask | winner_twice_mask) & team_bit(team_id)
+            ]
+            match_id, team_id, correct = rng.choice(candidates)
+            bit = team_bit(team_id)
+            if correct:
+                winner_twice_mask |= winner_mask & bit
+                winner_mask |= bit
+            else:
+                loser_mask |= bit
+            created_at = f"2025-09-{week % 28 + 1:02d}T19:00:00"
+            picks.append((user_id, match_id, team_id, week, created_at, int(correct)))
+            usage.append((user_id, team_id, 'winner' if correct else 'loser', week, created_at))
+    return picks, usage
+
+
+def build_league(db_path, users, seed=None):
+    """Create a league database with `users` users at db_path"""
+    rng = random.Random(users if seed is None else seed)
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    seed_database(cursor, tables=('teams', 'matches'))
+    games_by_week = _play_schedule(cursor, rng)
+
+    user_ids = list(range(1, users + 1))
+    cursor.executemany("INSERT INTO users (id, username) VALUES (?, ?)",
+                       [(user_id, f"user{user_id:05d}") for user_id in user_ids])
+    picks, usage = _make_picks(user_ids, games_by_week, rng)
+    cursor.executemany("""
+        INSERT INTO picks (user_id, match_id, team_id, week, created_at, is_correct)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, picks)
+    cursor.executemany("""
+        INSERT INTO team_usage (user_id, team_id, usage_type, week, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """, usage)
+
+    rebuild_standings(cursor)
+    rebuild_team_eligibility(cursor)
+    conn.commit()
+    conn.close()
@@ -0,0 +1,227 @@
+"""
+Load profile: the app under real gunicorn servers instead of the test client
+Starts the server twice against the same synthetic league - once with
+gunicorn's defaults (what `gunicorn app:app` used to run: one sync worker)
+and once with the shipped gunicorn.conf.py - and drives both with the same
+logged-in, keep-alive clients hitting the read API mix.
+
+    python -m benchmarks.load                                   # 1000 users, 32 clients, 20s each
+    python -m benchmarks.load --users 100 --clients 16 --duration 10
+    python -m benchmarks.load --streams 2                       # with live-update (SSE) tabs open
+    python -m benchmarks.load --streams 500                     # hundreds of idle tabs per worker
+    python -m benchmarks.load --rounds 5                        # alternate the profiles, report medians
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.league import OPEN_WEEK, build_league
+from benchmarks.worker import percentile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a logged-in player's browser polls, weighted like the page does
+REQUEST_MIX = (
+    '/api/dashboard',
+    '/api/leaderboard',
+    f'/api/matches?week={OPEN_WEEK}&compact=1',
+    '/api/dashboard',
+    '/api/all-picks',
+    f'/api/matches?week={OPEN_WEEK}&compact=1',
+)
+
+# Scheduling priority of the servers under test, below the load generator's
+SERVER_NICENESS = 10
+
+# What browsers send; the bodies are only counted, never decoded
+ACCEPT_ENCODING = 'gzip, deflate, br'
+
+PROFILES = {
+    'default': [],  # no config file: 1 sync worker, no keep-alive, no preload
+    'shipped': ['-c', os.path.join(REPO_ROOT, 'gunicorn.conf.py')],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/api/leaderboard')
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not come up")
+
+
+def _login(conn, user_id):
+    conn.request('POST', '/api/login', body=json.dumps({'username': f"user{user_id:05d}"}),
+                 headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    response.read()
+    return response.getheader('Set-Cookie').split(';', 1)[0]
+
+
+def _client(port, user_id, deadline, latencies, errors, sizes):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        cookie = _login(conn, user_id)
+    except (OSError, http.client.HTTPException) as e:
+        errors.append(type(e).__name__)
+        return
+
+    i = user_id
+    while time.monotonic() < deadline:
+        url = REQUEST_MIX[i % len(REQUEST_MIX)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            conn.request('GET', url, headers={'Cookie': cookie, 'Accept-Encoding': ACCEPT_ENCODING})
+            response = conn.getresponse()
+            body = response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(body))
+    conn.close()
+
+
+def _stream_client(port, user_id, deadline, statuses):
+    """An open browser tab: holds /api/stream until the run ends (a refused tab falls back to polling)"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+    try:
+        cookie = _login(conn, user_id)
+        conn.request('GET', '/api/stream', headers={'Cookie': cookie})
+        response = conn.getresponse()
+        statuses.append(response.status)
+        if response.status != 200:
+            # The page's 30 s ETag poll is part of the client mix already
+            return
+        while time.monotonic() < deadline:
+            try:
+                if not response.fp.readline():
+                    break  # stream ended by the server (worker restart)
+            except socket.timeout:
+                pass
+    except (OSError, http.client.HTTPException):
+        pass
+    finally:
+        conn.close()
+
+
+def run_profile(name, db_path, workdir, clients, duration, streams=0):
+    port = _free_port()
+    env = dict(os.environ, DATABASE_PATH=db_path, PORT=str(port), LOG_LEVEL='WARNING')
+    # Run from the temp dir so gunicorn does not pick up gunicorn.conf.py for the default profile.
+    # The clients stand in for remote browsers: at a lower priority the server never starves
+    # them of a shared CPU, which would time the load generator instead of the server.
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *PROFILES[name], '--chdir', REPO_ROOT,
+         '--bind', f'127.0.0.1:{port}', 'app:app'],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        preexec_fn=lambda: os.nice(SERVER_NICENESS),
+    )
+    try:
+        _wait_ready(port)
+        latencies, errors, sizes, statuses = [], [], [], []
+        deadline = time.monotonic() + duration
+        listeners = [threading.Thread(target=_stream_client, args=(port, clients + i, deadline, statuses))
+                     for i in range(1, streams + 1)]
+        for listener in listeners:
+            listener.start()
+        # Tabs open first, like players who keep the page around
+        if streams:
+            time.sleep(1)
+        threads = [threading.Thread(target=_client, args=(port, user_id, deadline, latencies, errors, sizes))
+                   for user_id in range(1, clients + 1)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads + listeners:
+            thread.join()
+        elapsed = time.monotonic() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+        'errors': len(errors),
+        'bytes_per_request': round(sum(sizes) / len(sizes)) if sizes else None,
+        'streams_open': statuses.count(200),
+    }
+
+
+def median_stats(runs):
+    """Median of every metric over the rounds of one profile (None when a round had no value)"""
+    return {key: (None if any(run[key] is None for run in runs)
+                  else round(statistics.median(run[key] for run in runs), 2))
+            for key in runs[0]}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.load', description=__doc__)
+    parser.add_argument('--users', type=int, default=1000, help='league size')
+    parser.add_argument('--clients', type=int, default=32, help='concurrent keep-alive clients')
+    parser.add_argument('--duration', type=float, default=20, help='seconds per profile')
+    parser.add_argument('--streams', type=int, default=0, help='clients holding /api/stream open meanwhile')
+    parser.add_argument('--rounds', type=int, default=1,
+                        help='run the profiles this many times, alternating, and report the medians')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='pickem-load-') as workdir:
+        db_path = os.path.join(workdir, 'league.db')
+        build_league(db_path, args.users)
+        print(f"🏈 {args.users} users, {args.clients} clients, {args.streams} SSE streams, "
+              f"{args.duration:.0f}s per profile, {args.rounds} rounds, {os.cpu_count()} CPUs")
+
+        # Alternating, so a noisy stretch of a shared host hits both profiles alike
+        runs = {name: [] for name in PROFILES}
+        for _ in range(args.rounds):
+            for name in PROFILES:
+                runs[name].append(run_profile(name, db_path, workdir, args.clients, args.duration, args.streams))
+        results = {name: median_stats(profile_runs) for name, profile_runs in runs.items()}
+
+    print(f"\n  {'profile':<10} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'bytes/req':>10}"
+          f" {'streams':>8}")
+    for name, stats in results.items():
+        p50, p95, p99, size = ('-' if stats[key] is None else stats[key]
+                               for key in ('p50_ms', 'p95_ms', 'p99_ms', 'bytes_per_request'))
+        streams = f"{stats['streams_open']}/{args.streams}"
+        print(f"  {name:<10} {stats['rps']:>8} {p50:>9} {p95:>9} {p99:>9} {stats['errors']:>7} {size:>10}"
+              f" {streams:>8}")
+    default, shipped = results['default']['rps'], results['shipped']['rps']
+    if default:
+        print(f"\n📈 shipped config: {shipped / default:.2f}x the throughput of the defaults")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,105 @@
+"""
+Benchmark driver: builds each league, measures it in a fresh process and
+compares the results with the previous baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.league import build_league
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(REPO_ROOT, 'benchmarks', 'baseline.json')
+
+LEAGUE_SIZES = (4, 100, 1000, 10000)
+
+# Requests per endpoint; the big leagues are slow enough to be stable with fewer
+ITERATIONS = {4: 200, 100: 200, 1000: 50, 10000: 10}
+
+# p50 growth that gets flagged as a regression
+REGRESSION_RATIO = 1.25
+
+
+def measure_league(users, iterations):
+    """Build a league in a temp dir and measure it in a separate process"""
+    with tempfile.TemporaryDirectory(prefix='pickem-bench-') as workdir:
+        db_path = os.path.join(workdir, 'league.db')
+        output = os.path.join(workdir, 'results.json')
+
+        started = time.perf_counter()
+        build_league(db_path, users)
+        print(f"🏗️  {users} users: league built in {time.perf_counter() - started:.1f}s")
+
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.worker', db_path, output, str(iterations)],
+            cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL,
+        )
+        with open(output, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def compare(previous, current):
+    """Print every endpoint with its change against the previous run; returns the regression count"""
+    regressions = 0
+    for size, endpoints in current.items():
+        print(f"\n👥 {size} users")
+        print(f"  {'endpoint':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'alloc KiB':>10} "
+              f"{'bytes':>8}")
+        for name, stats in endpoints.items():
+            before = previous.get(size, {}).get(name)
+            note = ''
+            if before:
+                ratio = stats['p50_ms'] / before['p50_ms'] if before['p50_ms'] else 1.0
+                note = f"  {ratio - 1:+.0%} p50"
+                if stats['queries'] != before['queries']:
+                    note += f", queries {before['queries']} -> {stats['queries']}"
+                if ratio > REGRESSION_RATIO or stats['queries'] > before['queries']:
+                    note += "  ❌ REGRESSION"
+                    regressions += 1
+            size_bytes = stats.get('bytes')
+            print(f"  {name:<20} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} "
+                  f"{stats['queries']:>8} {stats['alloc_kib']:>10.1f} {'-' if size_bytes is None else size_bytes:>8}{note}")
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('--sizes', default=','.join(map(str, LEAGUE_SIZES)),
+                        help='comma separated league sizes (users)')
+    parser.add_argument('--iterations', type=int, help='requests per endpoint for every size')
+    parser.add_argument('--output', default=BASELINE_FILE, help='where to write the results')
+    args = parser.parse_args(argv)
+
+    previous = {}
+    if os.path.exists(args.output):
+        with open(args.output, encoding='utf-8') as f:
+            previous = json.load(f).get('results', {})
+
+    results = {}
+    for users in (int(size) for size in args.sizes.split(',')):
+        iterations = args.iterations or ITERATIONS.get(users, 20)
+        results[str(users)] = measure_league(users, iterations)
+
+    regressions = compare(previous, results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'environment': {
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+            },
+            'results': {**previous, **results},
+        }, f, indent=2)
+        f.write('\n')
+
+    print(f"\n📝 Results written to {os.path.relpath(args.output)}")
+    if regressions:
+        print(f"❌ {regressions} possible regression(s) against the previous run")
+    return 1 if regressions else 0
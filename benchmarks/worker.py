@@ -0,0 +1,142 @@
+"""
+Measures the API endpoints against one league database
+Runs in its own process (see run.py) because app.py binds DATABASE_PATH at
+import time and keeps per-process caches.
+
+    python -m benchmarks.worker <db_path> <output.json> <iterations>
+"""
+
+import json
+import logging
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+# Allocation passes run under tracemalloc, which is slow; fewer samples suffice
+ALLOC_ITERATIONS = 5
+
+# Statements that are transaction control, not queries
+_CONTROL = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def measure(call, iterations, query_counter):
+    """Time `call` and count its queries, allocations and response bytes"""
+    warmup = call()  # warm up caches and the pooled connection
+
+    timings, queries = [], []
+    for _ in range(iterations):
+        query_counter[0] = 0
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(query_counter[0])
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(min(iterations, ALLOC_ITERATIONS)):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        call()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'queries': max(queries),
+        'alloc_kib': round(sorted(peaks)[len(peaks) // 2] / 1024, 1),
+        # Buffered responses only (streams and non-HTTP calls have no length)
+        'bytes': getattr(warmup, 'content_length', None),
+    }
+
+
+def run(db_path, iterations):
+    os.environ['DATABASE_PATH'] = db_path
+    import app as pickem
+    from benchmarks.league import OPEN_WEEK
+    from snapshot import ReadSnapshot
+
+    # Request logging would dominate the small endpoints and flood the console
+    logging.getLogger().setLevel(logging.WARNING)
+
+    query_counter = [0]
+
+    def count_query(statement):
+        if not statement.lstrip().upper().startswith(_CONTROL):
+            query_counter[0] += 1
+
+    # The test client serves requests on this thread, i.e. on this pooled connection
+    pickem.db_manager.connection().set_trace_callback(count_query)
+
+    client = pickem.app.test_client()
+    user_id = 1
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+        session['username'] = f"user{user_id:05d}"
+
+    def get(url):
+        def call():
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code, response.get_data(as_text=True))
+            return response
+        return call
+
+    def stream(url):
+        # Consume the body chunk by chunk like a socket would, without keeping it
+        def call():
+            response = client.get(url, buffered=False)
+            assert response.status_code == 200, (url, response.status_code)
+            for _ in response.iter_encoded():
+                pass
+            response.close()
+            return response
+        return call
+
+    # A team the user has never picked, so saving it again and again stays valid
+    matches = get(f'/api/matches?week={OPEN_WEEK}')().get_json()
+    dashboard = get('/api/dashboard')().get_json()
+    used = set(dashboard['winner_teams']) | set(dashboard['loser_teams'])
+    pick = next(
+        {'match_id': match['id'], 'team_id': team['id'], 'week': OPEN_WEEK}
+        for match in matches['matches']
+        for team in (match['home_team'], match['away_team'])
+        if team['id'] not in matches['unpickable_teams'] and team['name'] not in used
+    )
+
+    def save_pick():
+        response = client.post('/api/picks', json=pick)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response
+
+    endpoints = {
+        'dashboard': get('/api/dashboard'),
+        'leaderboard': get('/api/leaderboard'),
+        'all_picks': get('/api/all-picks'),
+        'all_picks_ndjson': stream('/api/all-picks?format=ndjson'),
+        'get_matches': get(f'/api/matches?week={OPEN_WEEK}'),
+        'get_matches_compact': get(f'/api/matches?week={OPEN_WEEK}&compact=1'),
+        'teams': get('/api/teams'),
+        # What a page load costs in one request instead of four
+        'bootstrap': get('/api/bootstrap'),
+        'save_pick': save_pick,
+        # Cost of one READ_SNAPSHOT rebuild (backup of the whole database into memory)
+        'snapshot_refresh': ReadSnapshot(db_path, lambda: None).refresh,
+    }
+    return {name: measure(call, iterations, query_counter) for name, call in endpoints.items()}
+
+
+if __name__ == '__main__':
+    db_path, output, iterations = sys.argv[1], sys.argv[2], int(sys.argv[3])
+    results = run(db_path, iterations)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
@@ -0,0 +1,130 @@
+"""
+Response compression for NFL PickEm
+Negotiates brotli (when the brotli package is installed) or gzip from
+Accept-Encoding for text responses above a size threshold. Responses with an
+ETag are the same bytes for everyone who gets that ETag (the page shell, the
+leaderboard, a user's week of games), so their compressed bodies are kept in
+a bounded LRU keyed by (ETag, encoding) and compressed once per version, not
+once per request. Streams (/api/stream, NDJSON) are passed through untouched.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+# Below this the headers cost more than the savings
+MIN_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Compressed bodies kept for ETag'd responses, per worker
+MAX_CACHED_BYTES = 16 * 1024 * 1024
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/javascript', 'image/svg+xml',
+    'text/css', 'text/html', 'text/javascript', 'text/plain'
+}
+
+
+def _gzip(data):
+    # mtime=0: the same body always compresses to the same bytes
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=BROTLI_QUALITY)
+
+
+ENCODERS = {'br': _brotli, 'gzip': _gzip} if brotli is not None else {'gzip': _gzip}
+
+
+class Compressor:
+    """Compresses Flask responses in place (call from an after_request hook).
+
+    Compressed responses get a weak ETag: the bytes differ from the identity
+    representation, the content does not, and If-None-Match compares weakly.
+    """
+
+    def __init__(self, min_size=MIN_SIZE, max_cached_bytes=MAX_CACHED_BYTES):
+        self.min_size = min_size
+        self.max_cached_bytes = max_cached_bytes
+        self._cache = OrderedDict()   # (etag, encoding) -> compressed body
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self.compressed = self.hits = self.misses = self.evictions = 0
+        self.bytes_in = self.bytes_out = 0
+
+    def negotiate(self, accept_encodings):
+        """Best encoding the client accepts, None for identity"""
+        return accept_encodings.best_match(list(ENCODERS))
+
+    def apply(self, request, response):
+        if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        body = self._cached(etag, encoding, data) if etag else ENCODERS[encoding](data)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(body)
+        return response
+
+    def _cached(self, etag, encoding, data):
+        key = (etag, encoding)
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = ENCODERS[encoding](data)
+        if len(body) > self.max_cached_bytes:
+            return body
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = body
+                self._cached_bytes += len(body)
+            while self._cached_bytes > self.max_cached_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+                self.evictions += 1
+        return body
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'encodings': list(ENCODERS),
+                'min_size': self.min_size,
+                'compressed': self.compressed,
+                'ratio': round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else None,
+                'entries': len(self._cache),
+                'cached_bytes': self._cached_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions
+            }
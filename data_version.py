@@ -0,0 +1,112 @@
+"""
+Monotonic data versions shared by all worker processes
+A tiny memory-mapped counter file next to the database. Writers bump the
+relevant counters after committing; readers derive ETags from them without
+touching SQLite at all.
+"""
+
+import mmap
+import os
+import secrets
+import threading
+
+from forksafe import fcntl
+
+# Slot layout: [epoch, results, picks, events, user slots...]
+EPOCH = 0
+RESULTS = 1
+PICKS = 2
+EVENTS = 3
+USER_BASE = 4
+USER_SLOTS = 4096   # per-user counters are hashed into this many slots
+
+_SLOT_COUNT = USER_BASE + USER_SLOTS
+_FILE_SIZE = _SLOT_COUNT * 8
+
+
+class DataVersions:
+    """Process-shared version counters backed by an mmap'd file.
+
+    The epoch is random per file, so versions never repeat after the file is
+    recreated. Per-user slots may collide; a collision only causes a spurious
+    cache miss, never a stale hit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._counters = None
+        self._open_lock = threading.Lock()
+        self._bump_lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        # flock() locks belong to the open file, which a forked child shares with
+        # its parent; reopen so bumps in different workers exclude each other
+        self._fd = None
+        self._counters = None
+        self._open_lock = threading.Lock()
+        self._bump_lock = threading.Lock()
+
+    def _lock_file(self, fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(self, fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _ensure_open(self):
+        if self._counters is not None:
+            return self._counters
+        with self._open_lock:
+            if self._counters is None:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                self._lock_file(fd)
+                try:
+                    if os.fstat(fd).st_size != _FILE_SIZE:
+                        os.ftruncate(fd, 0)
+                        os.ftruncate(fd, _FILE_SIZE)
+                        fresh = True
+                    else:
+                        fresh = False
+                    counters = memoryview(mmap.mmap(fd, _FILE_SIZE)).cast('q')
+                    if fresh or counters[EPOCH] == 0:
+                        counters[EPOCH] = secrets.randbits(62) + 1
+                finally:
+                    self._unlock_file(fd)
+                self._fd = fd
+                self._counters = counters
+        return self._counters
+
+    def user_slot(self, user_id):
+        return USER_BASE + user_id % USER_SLOTS
+
+    def get(self, *slots):
+        """Read the epoch plus the given counters as a tuple"""
+        counters = self._ensure_open()
+        return (counters[EPOCH],) + tuple(counters[slot] for slot in slots)
+
+    def bump(self, *slots):
+        """Increment the given counters (call after the write has committed)"""
+        counters = self._ensure_open()
+        with self._bump_lock:
+            self._lock_file(self._fd)
+            try:
+                for slot in slots:
+                    counters[slot] += 1
+            finally:
+                self._unlock_file(self._fd)
+
+    def reset(self):
+        """Start a new epoch, e.g. after the database was (re)seeded"""
+        counters = self._ensure_open()
+        with self._bump_lock:
+            self._lock_file(self._fd)
+            try:
+                for slot in range(1, _SLOT_COUNT):
+                    counters[slot] = 0
+                counters[EPOCH] = secrets.randbits(62) + 1
+            finally:
+                self._unlock_file(self._fd)
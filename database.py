@@ -0,0 +1,142 @@
+"""
+SQLite connection management for NFL PickEm
+Per-thread pooled connections, pre-tuned with the PRAGMAs every route needs.
+A connection lives as long as its thread: servers that start a thread per
+request (the Werkzeug dev server) get it closed again when the thread ends.
+"""
+
+import os
+import sqlite3
+import threading
+import logging
+import weakref
+from contextlib import contextmanager
+
+from forksafe import fcntl
+
+logger = logging.getLogger(__name__)
+
+# PRAGMAs applied once to every pooled connection
+DEFAULT_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 64 * 1024 * 1024),   # 64 MB memory-mapped I/O
+    ('cache_size', -16 * 1024),         # 16 MB page cache (negative = KiB)
+    ('busy_timeout', 5000),             # wait up to 5s for a writer
+    ('temp_store', 'MEMORY'),
+)
+
+
+class _Holder:
+    """A thread's connection, kept only in that thread's local storage.
+
+    Thread-local storage is dropped when the thread ends, which collects the
+    holder and fires the finalizer that closes the connection.
+    """
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionManager:
+    """Hands out one long-lived, pre-configured connection per thread.
+
+    Connections are created lazily the first time a thread asks for one and
+    are reused for every following request served by that thread. They are
+    closed when the thread exits or by close_all().
+    """
+
+    def __init__(self, db_path, pragmas=DEFAULT_PRAGMAS, factory=sqlite3.Connection):
+        self.db_path = db_path
+        self.pragmas = pragmas
+        self.factory = factory
+        self._local = threading.local()
+        # Reentrant: a finalizer may run on a thread that already holds it
+        self._lock = threading.RLock()
+        self._connections = {}   # connection -> finalizer that closes it
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def _forget(self):
+        # SQLite connections must not be used across fork; the child opens its own.
+        # Closing the inherited ones could drop locks the parent still holds,
+        # so their finalizers are detached rather than run.
+        for finalizer in self._connections.values():
+            finalizer.detach()
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._connections = {}
+
+    def _connect(self):
+        # check_same_thread=False only so close_all() and the finalizers can
+        # close connections owned by other threads; each connection is used
+        # by exactly one thread while serving requests.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=self.factory)
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._connections.pop(conn, None)
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Error closing pooled connection: %s", e)
+
+    def connection(self):
+        """Return this thread's pooled connection, creating it if needed"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = _Holder(self._connect())
+            finalizer = weakref.finalize(holder, self._discard, holder.conn)
+            with self._lock:
+                self._connections[holder.conn] = finalizer
+            self._local.holder = holder
+        return holder.conn
+
+    def disconnect(self):
+        """Close this thread's connection now, e.g. before it idles in a long-lived stream"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            return
+        del self._local.holder
+        with self._lock:
+            finalizer = self._connections.get(holder.conn)
+        if finalizer is not None:
+            finalizer()
+
+    def open_connections(self):
+        with self._lock:
+            return len(self._connections)
+
+    def release(self, conn):
+        """Return a connection to the pool at the end of an app context"""
+        # Never leak an open transaction into the next request
+        if conn.in_transaction:
+            conn.rollback()
+
+    def close_all(self):
+        """Close every pooled connection (worker shutdown)"""
+        with self._lock:
+            finalizers = list(self._connections.values())
+        for finalizer in finalizers:
+            finalizer()
+        # Threads still alive will reconnect lazily if they need to
+        self._local = threading.local()
+        logger.info("Closed %s pooled database connections", len(finalizers))
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive advisory lock on `path` across processes (e.g. booting workers)"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
@@ -0,0 +1,144 @@
+"""
+Per-user team eligibility as 32-bit team masks
+Bit (team_id - 1) represents a team, so a user's whole usage history fits in
+a couple of integers and "which teams are blocked this week" is a handful of
+bitwise operations instead of three queries and a pile of Python sets.
+"""
+
+import threading
+
+# Reasons shown in the UI, indexed by (loser | twice << 1 | opponent << 2)
+_REASON_PARTS = ("Als Verlierer verwendet", "2x als Gewinner verwendet", "Gegner eines Verlierer-Teams")
+BLOCK_REASONS = tuple(
+    " & ".join(part for bit, part in enumerate(_REASON_PARTS) if combo & (1 << bit))
+    for combo in range(8)
+)
+
+
+def team_bit(team_id):
+    """Mask bit for a team id (1-32)"""
+    return 1 << (team_id - 1)
+
+
+def mask_to_team_ids(mask):
+    """Expand a team mask back into a list of team ids"""
+    team_ids = []
+    while mask:
+        low = mask & -mask
+        team_ids.append(low.bit_length())
+        mask ^= low
+    return team_ids
+
+
+USAGE_COUNTS_SQL = """
+    SELECT team_id, usage_type, COUNT(*)
+    FROM team_usage
+    WHERE user_id = ?
+    GROUP BY team_id, usage_type
+"""
+
+USER_MASKS_SQL = "SELECT loser_mask, winner_twice_mask FROM team_eligibility WHERE user_id = ?"
+
+
+def _masks_from_usage(rows):
+    """Fold (team_id, usage_type, count) rows into (loser, winner, winner_twice) masks"""
+    loser_mask = winner_mask = winner_twice_mask = 0
+    for team_id, usage_type, count in rows:
+        bit = team_bit(team_id)
+        if usage_type == 'loser':
+            loser_mask |= bit
+        elif usage_type == 'winner':
+            winner_mask |= bit
+            if count >= 2:
+                winner_twice_mask |= bit
+    return loser_mask, winner_mask, winner_twice_mask
+
+
+def refresh_team_eligibility(cursor, user_id):
+    """Recompute a user's masks from team_usage (call after changing their usage)"""
+    cursor.execute(USAGE_COUNTS_SQL, (user_id,))
+    masks = _masks_from_usage(cursor.fetchall())
+    cursor.execute("""
+        INSERT OR REPLACE INTO team_eligibility (user_id, loser_mask, winner_mask, winner_twice_mask)
+        VALUES (?, ?, ?, ?)
+    """, (user_id,) + masks)
+    return masks
+
+
+def rebuild_team_eligibility(cursor):
+    """Recompute the masks of every user from team_usage"""
+    cursor.execute("""
+        SELECT user_id, team_id, usage_type, COUNT(*)
+        FROM team_usage
+        GROUP BY user_id, team_id, usage_type
+    """)
+    usage_by_user = {}
+    for user_id, team_id, usage_type, count in cursor.fetchall():
+        usage_by_user.setdefault(user_id, []).append((team_id, usage_type, count))
+
+    cursor.execute("SELECT id FROM users")
+    user_ids = [row[0] for row in cursor.fetchall()]
+
+    cursor.execute("DELETE FROM team_eligibility")
+    cursor.executemany("""
+        INSERT INTO team_eligibility (user_id, loser_mask, winner_mask, winner_twice_mask)
+        VALUES (?, ?, ?, ?)
+    """, [(user_id,) + _masks_from_usage(usage_by_user.get(user_id, ())) for user_id in user_ids])
+
+
+def get_user_masks(cursor, user_id):
+    """Return (loser_mask, winner_twice_mask) for a user"""
+    cursor.execute(USER_MASKS_SQL, (user_id,))
+    return cursor.fetchone() or (0, 0)
+
+
+class OpponentTable:
+    """Per-week opponent masks: opponents[week][team_id] = mask of that week's opponents.
+
+    Built once from the schedule and shared by all requests. The table is
+    tagged with the data version it was built from, so a re-seed by another
+    process (which resets the version) rebuilds it like WeekScheduleCache;
+    invalidate() drops it at once in this process.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._weeks = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._version = self._weeks = None
+
+    def _load(self, cursor):
+        cursor.execute("SELECT week, home_team_id, away_team_id FROM matches")
+        weeks = {}
+        for week, home_id, away_id in cursor.fetchall():
+            opponents = weeks.setdefault(week, [0] * 33)
+            opponents[home_id] |= team_bit(away_id)
+            opponents[away_id] |= team_bit(home_id)
+        return {week: tuple(opponents) for week, opponents in weeks.items()}
+
+    def for_week(self, cursor, week, version):
+        with self._lock:
+            if self._weeks is None or self._version != version:
+                self._weeks = self._load(cursor)
+                self._version = version
+            weeks = self._weeks
+        return weeks.get(week)
+
+
+def blocked_teams(loser_mask, winner_twice_mask, week_opponents):
+    """Compute (blocked_mask, {team_id: reason}) for one user and week"""
+    opponent_mask = 0
+    if week_opponents is not None:
+        for team_id in mask_to_team_ids(loser_mask):
+            opponent_mask |= week_opponents[team_id]
+
+    blocked_mask = loser_mask | winner_twice_mask | opponent_mask
+    reasons = {}
+    for team_id in mask_to_team_ids(blocked_mask):
+        bit = team_bit(team_id)
+        combo = bool(loser_mask & bit) | bool(winner_twice_mask & bit) << 1 | bool(opponent_mask & bit) << 2
+        reasons[team_id] = BLOCK_REASONS[combo]
+    return blocked_mask, reasons
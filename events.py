@@ -0,0 +1,169 @@
+"""
+Live events for the Server-Sent Events stream
+Writers append compact events to the `events` table inside their transaction.
+One broker thread per worker notices new events through the shared data
+version counter (a memory read, no query), loads them once and fans the
+pre-formatted SSE frames out to every connected client.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from forksafe import ForkSafeThread
+
+logger = logging.getLogger(__name__)
+
+# Keep this many events around for clients resuming with Last-Event-ID
+EVENT_RETENTION = 1000
+
+# Seconds between broker checks and between keepalive comments
+POLL_INTERVAL = 0.5
+KEEPALIVE_INTERVAL = 15
+
+# Slow clients get dropped instead of buffering without bound
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Streams one worker holds at once (SSE_MAX_STREAMS). Under the gevent workers
+# an idle stream costs a greenlet and its queue; the cap only bounds memory,
+# clients past it get a 503 and poll with ETags instead.
+DEFAULT_MAX_STREAMS = 1000
+
+# Last item on a dropped subscriber's queue: its stream ends, the browser
+# reconnects and catches up through Last-Event-ID
+CLOSED = None
+
+
+def publish_event(cursor, event_type, payload):
+    """Append an event within the caller's transaction (bump EVENTS after commit)"""
+    cursor.execute("""
+        INSERT INTO events (event_type, payload, created_at) VALUES (?, ?, ?)
+    """, (event_type, json.dumps(payload, separators=(',', ':')), datetime.now().isoformat()))
+    cursor.execute("DELETE FROM events WHERE id <= ?", (cursor.lastrowid - EVENT_RETENTION,))
+
+
+def max_streams_from_env():
+    return int(os.environ.get('SSE_MAX_STREAMS', DEFAULT_MAX_STREAMS))
+
+
+def format_event(event_type, data, event_id=None):
+    """Encode one SSE frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+class EventBroker:
+    """Fans events out to the SSE subscribers of this worker process"""
+
+    def __init__(self, db_manager, data_versions, events_slot, max_subscribers=DEFAULT_MAX_STREAMS):
+        self.db_manager = db_manager
+        self.data_versions = data_versions
+        self.events_slot = events_slot
+        self.max_subscribers = max_subscribers
+        self.rejected = 0
+        self._stopping = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = ForkSafeThread(self._run, 'sse-broker', setup=self._catch_up)
+        self._seen_version = None
+        self._last_id = 0
+
+    def subscribe(self):
+        """Register a client; returns the queue its frames arrive on, None when the worker is full"""
+        self._thread.ensure_started()
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def stats(self):
+        with self._lock:
+            return {'open': len(self._subscribers), 'max': self.max_subscribers, 'rejected': self.rejected}
+
+    def replay(self, after_id):
+        """Frames a reconnecting client missed since Last-Event-ID"""
+        cursor = self.db_manager.connection().cursor()
+        cursor.execute("""
+            SELECT id, event_type, payload FROM events WHERE id > ? ORDER BY id LIMIT ?
+        """, (after_id, EVENT_RETENTION))
+        return [format_event(event_type, payload, event_id) for event_id, event_type, payload in cursor.fetchall()]
+
+    def broadcast(self, frame):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(frame)
+            except queue.Full:
+                logger.warning("Dropping slow SSE subscriber")
+                self.unsubscribe(subscriber)
+                self._close(subscriber)
+
+    def stop_when(self, predicate):
+        """End every stream once predicate() is true, e.g. when the worker process shuts down"""
+        self._stopping = predicate
+
+    def _close_all(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscriber in subscribers:
+            self._close(subscriber)
+
+    def _close(self, subscriber):
+        # Frames still queued are replayed on reconnect; only the broker puts, so there is room now
+        while True:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                break
+        subscriber.put_nowait(CLOSED)
+
+    def _catch_up(self):
+        # A new broker thread only forwards events newer than the ones already in the table
+        conn = self.db_manager.connection()
+        self._seen_version = self.data_versions.get(self.events_slot)
+        self._last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    def _run(self):
+        while True:
+            time.sleep(POLL_INTERVAL)
+            try:
+                if self._stopping is not None and self._stopping():
+                    self._close_all()
+                self._poll()
+            except Exception as e:
+                logger.error("SSE broker error: %s", e)
+
+    def _poll(self):
+        version = self.data_versions.get(self.events_slot)
+        if version == self._seen_version:
+            return
+        self._seen_version = version
+
+        cursor = self.db_manager.connection().cursor()
+        cursor.execute("""
+            SELECT id, event_type, payload FROM events WHERE id > ? ORDER BY id
+        """, (self._last_id,))
+        for event_id, event_type, payload in cursor.fetchall():
+            self._last_id = event_id
+            self.broadcast(format_event(event_type, payload, event_id))
@@ -0,0 +1,60 @@
+"""
+Process helpers for code that runs in preforked gunicorn workers
+The app is imported once in the master and then forked. Threads started
+before the fork do not exist in the child, and file locks need fcntl, which
+Windows dev machines do not have.
+"""
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single process, no file locking
+    fcntl = None
+
+
+class ForkSafeThread:
+    """A daemon thread that is (re)started on demand in whichever process asks.
+
+    Threads do not survive a fork, so ensure_started() checks on every call,
+    by process id: Thread.is_alive() yields to other greenlets under gevent,
+    which would send every request that calls it to the back of the queue.
+    The targets loop forever, so a thread only goes missing in a forked child.
+    setup() runs under the start lock just before a new thread starts, e.g.
+    to read the state the thread continues from. The thread waits for work
+    with wait(timeout); wake() ends that wait early.
+    """
+
+    def __init__(self, target, name, setup=None):
+        self.target = target
+        self.name = name
+        self.setup = setup
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                if self.setup is not None:
+                    self.setup()
+                self._thread = threading.Thread(target=self.target, name=self.name, daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def wake(self):
+        """Start the thread if needed and end its current wait()"""
+        self.ensure_started()
+        self._wakeup.set()
+
+    def wait(self, timeout=None):
+        """Called by the thread itself: sleep until wake() or `timeout` seconds"""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
@@ -0,0 +1,54 @@
+"""
+Gunicorn settings for NFL PickEm (picked up automatically from the working directory)
+
+gevent workers: every process serves its connections on greenlets, keeps
+them alive for a few seconds and holds /api/stream (SSE) clients for the
+cost of a greenlet and a queue each, so open tabs never take capacity away
+from normal requests. The app is preloaded, so migrations and seeding run
+once in the master before the workers fork. SQLite in WAL mode lets all
+workers read concurrently; writes are short and wait on busy_timeout.
+
+    gunicorn app:app                            # uses this file
+    WEB_CONCURRENCY=4 gunicorn app:app
+"""
+
+# Patched before the app is preloaded, so the locks, queues, thread-locals and
+# background threads it creates are the cooperative ones the workers run on
+from gevent import monkey
+monkey.patch_all()
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+worker_class = 'gevent'
+# Requests are CPU-bound (SQLite and JSON) and one process uses one core, so
+# one worker per core; more only add context switches
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count(), 8)))
+# Open connections per worker, live-update streams included (at most SSE_MAX_STREAMS)
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 2000))
+
+preload_app = True
+
+# A worker that stops heart-beating for this long is restarted (the gevent
+# worker beats from its main loop, so long SSE streams do not count against it)
+timeout = 30
+graceful_timeout = 30
+# Behind Render's proxy: reuse connections for a few seconds
+keepalive = 5
+
+# Recycle workers now and then so slow leaks cannot accumulate. Rarely: a
+# recycle drops every live stream of the worker at once (the tabs reconnect)
+max_requests = 100000
+max_requests_jitter = 10000
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    # A restarting worker (max_requests, deploys) waits for its open requests;
+    # end the live streams so it exits at once, the browsers reconnect elsewhere
+    from app import event_broker
+    event_broker.stop_when(lambda: not worker.alive)
@@ -0,0 +1,191 @@
+"""
+Durable background jobs for NFL PickEm
+Requests enqueue work into the `jobs` table inside their own transaction and
+return right away. A worker thread in every app process claims queued jobs in
+batches (claims serialize on SQLite's write lock, so each job runs once) and
+processes a whole batch in one transaction. Jobs of a process that died are
+picked up again after STALE_AFTER seconds. Finished jobs are pruned as new
+ones are queued, so the table stays at about JOB_RETENTION rows.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+
+from forksafe import ForkSafeThread
+
+logger = logging.getLogger(__name__)
+
+# Jobs of one type processed per transaction
+JOB_BATCH_SIZE = 100
+
+# Seconds between checks for jobs queued by other processes
+POLL_INTERVAL = 1.0
+
+# Give up on a job after this many failed attempts
+MAX_ATTEMPTS = 3
+
+# Seconds a running job may take before it counts as abandoned
+STALE_AFTER = 300
+
+# Finished jobs older than the latest this many are deleted (like EVENT_RETENTION)
+JOB_RETENTION = 1000
+
+# Oldest job that is waiting or was abandoned by a dead process
+NEXT_JOB_SQL = """
+    SELECT job_type FROM jobs
+    WHERE status = 'queued' OR (status = 'running' AND started_at < ?)
+    ORDER BY id LIMIT 1
+"""
+
+
+def enqueue_jobs(cursor, job_type, payloads):
+    """Queue jobs within the caller's transaction; returns their ids"""
+    now = datetime.now().isoformat()
+    job_ids = []
+    for payload in payloads:
+        cursor.execute("""
+            INSERT INTO jobs (job_type, payload, status, created_at) VALUES (?, ?, 'queued', ?)
+        """, (job_type, json.dumps(payload, separators=(',', ':')), now))
+        job_ids.append(cursor.lastrowid)
+    if job_ids:
+        # Queued and running jobs stay whatever their age
+        cursor.execute("""
+            DELETE FROM jobs WHERE status IN ('done', 'failed') AND id <= ?
+        """, (job_ids[-1] - JOB_RETENTION,))
+    return job_ids
+
+
+def job_status(cursor, recent=20):
+    """Queue depth per status, lag of the oldest queued job and the latest jobs"""
+    cursor.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+    counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+    counts.update(cursor.fetchall())
+
+    cursor.execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'")
+    oldest = cursor.fetchone()[0]
+    lag = (datetime.now() - datetime.fromisoformat(oldest)).total_seconds() if oldest else 0.0
+
+    cursor.execute("""
+        SELECT id, job_type, payload, status, attempts, result, error, created_at, started_at, finished_at
+        FROM jobs ORDER BY id DESC LIMIT ?
+    """, (recent,))
+    jobs = [
+        {
+            'id': job_id,
+            'type': job_type,
+            'payload': json.loads(payload),
+            'status': status,
+            'attempts': attempts,
+            'result': json.loads(result) if result else None,
+            'error': error,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at
+        }
+        for job_id, job_type, payload, status, attempts, result, error, created_at, started_at, finished_at
+        in cursor.fetchall()
+    ]
+    return {'counts': counts, 'lag_seconds': round(lag, 3), 'jobs': jobs}
+
+
+class JobWorker:
+    """Processes queued jobs on a background thread of this process.
+
+    handlers maps job_type -> fn(cursor, payloads) returning one JSON-able
+    result per payload; it runs inside the batch transaction. after_commit
+    (job_type) runs once a batch is committed, e.g. to bump data versions.
+    """
+
+    def __init__(self, db_manager, handlers, after_commit=None):
+        self.db_manager = db_manager
+        self.handlers = handlers
+        self.after_commit = after_commit
+        self._thread = ForkSafeThread(self._run, 'job-worker')
+
+    def ensure_started(self):
+        self._thread.ensure_started()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def wake(self):
+        """Process new jobs now instead of at the next poll"""
+        self._thread.wake()
+
+    def _run(self):
+        while True:
+            try:
+                while self._process_batch():
+                    pass
+            except Exception as e:
+                logger.error("Job worker error: %s", e)
+            self._thread.wait(POLL_INTERVAL)
+
+    def _claim(self, conn):
+        """Mark the next batch of one job type as running; returns (job_type, [(id, payload)])"""
+        now = datetime.now()
+        stale = (now - timedelta(seconds=STALE_AFTER)).isoformat()
+        cursor = conn.cursor()
+        # Idle polls stay a plain indexed read; only take the write lock when there is work
+        cursor.execute(NEXT_JOB_SQL, (stale,))
+        if cursor.fetchone() is None:
+            return None, []
+
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute(NEXT_JOB_SQL, (stale,))
+            row = cursor.fetchone()
+            if row is None:
+                conn.rollback()
+                return None, []
+            job_type = row[0]
+            cursor.execute("""
+                SELECT id, payload FROM jobs
+                WHERE job_type = ? AND (status = 'queued' OR (status = 'running' AND started_at < ?))
+                ORDER BY id LIMIT ?
+            """, (job_type, stale, JOB_BATCH_SIZE))
+            jobs = [(job_id, json.loads(payload)) for job_id, payload in cursor.fetchall()]
+            cursor.executemany("""
+                UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ? WHERE id = ?
+            """, [(now.isoformat(), job_id) for job_id, _ in jobs])
+            conn.commit()
+            return job_type, jobs
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _process_batch(self):
+        """Claim and process one batch; returns False when the queue is empty"""
+        conn = self.db_manager.connection()
+        job_type, jobs = self._claim(conn)
+        if not jobs:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            handler = self.handlers[job_type]
+            cursor.execute("BEGIN IMMEDIATE")
+            results = handler(cursor, [payload for _, payload in jobs])
+            finished = datetime.now().isoformat()
+            cursor.executemany("""
+                UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ? WHERE id = ?
+            """, [(json.dumps(result, separators=(',', ':')), finished, job_id)
+                  for (job_id, _), result in zip(jobs, results)])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error("Job batch %s (%s jobs) failed: %s", job_type, len(jobs), e)
+            cursor.executemany("""
+                UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                                error = ?, finished_at = ?
+                WHERE id = ?
+            """, [(MAX_ATTEMPTS, str(e), datetime.now().isoformat(), job_id) for job_id, _ in jobs])
+            conn.commit()
+            # Retry on the next poll rather than in a tight loop
+            return False
+
+        logger.info("Processed %s %s jobs", len(jobs), job_type)
+        if self.after_commit is not None:
+            self.after_commit(job_type)
+        return True
@@ -0,0 +1,45 @@
+"""
+JSON responses for NFL PickEm
+Every API response goes through app.json. With orjson installed, bodies are
+serialized straight to bytes by orjson (several times faster than the stdlib
+encoder on the leaderboard and pick lists); without it the stdlib encoder is
+used as before. Either way keys keep their insertion order instead of being
+sorted, and non-string dict keys (match ids, team ids) become strings.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib encoder works the same, only slower
+    orjson = None
+
+if orjson is not None:
+    # Dates are handed to Flask's default (HTTP dates), like the stdlib path does
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            if 'indent' not in kwargs:
+                kwargs.setdefault('separators', (',', ':'))
+            return super().dumps(obj, **kwargs)
+        return self._orjson(obj).decode()
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = self._orjson(obj, orjson.OPT_INDENT_2 if pretty else 0) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _orjson(self, obj, option=0):
+        try:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS | option)
+        except TypeError:
+            # Out of orjson's range (e.g. integers beyond 64 bits): the stdlib handles it
+            return super().dumps(obj, separators=(',', ':')).encode()
@@ -0,0 +1,147 @@
+"""
+Logging setup for NFL PickEm
+Request threads only put log records on a bounded in-memory queue; one
+listener thread per worker formats them (JSON lines by default) and writes
+them to stderr. Messages use %-style arguments, so a record that is filtered
+out or sampled away is never formatted at all.
+
+    LOG_LEVEL=INFO                       root level
+    LOG_LEVELS=app=DEBUG,jobs=WARNING    per-module levels
+    LOG_SAMPLE=app=0.01                  keep 1% of the app logger's debug/info lines
+    LOG_FORMAT=json|text
+"""
+
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Records waiting for the listener; beyond this they are dropped, never blocking a request
+QUEUE_SIZE = 10000
+
+TEXT_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+
+# Attributes every LogRecord has; anything else was passed with extra= and is logged as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message plus any extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'pid': record.process,
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in every 1/rate records below WARNING for the configured loggers.
+
+    Rates apply to a logger and its children; warnings and errors always pass.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def _rate(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return self.rates.get('root', 1.0)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        every = round(1 / rate)
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+        return count % every == 0
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread.
+
+    The stock handler formats in the caller so records can be pickled; this
+    queue never leaves the process. A full queue drops the record.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_pairs(value, convert):
+    pairs = {}
+    for item in filter(None, (part.strip() for part in (value or '').split(','))):
+        name, _, setting = item.partition('=')
+        pairs[name.strip()] = convert(setting.strip())
+    return pairs
+
+
+def configure_logging(environ=os.environ, stream=None):
+    """Install the queue handler on the root logger and start the listener; returns the listener"""
+    output = logging.StreamHandler(stream or sys.stderr)
+    if environ.get('LOG_FORMAT', 'json').lower() == 'text':
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    handler = DeferredQueueHandler(queue.Queue(QUEUE_SIZE))
+    rates = _parse_pairs(environ.get('LOG_SAMPLE'), float)
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(environ.get('LOG_LEVEL', 'INFO').upper())
+    for name, level in _parse_pairs(environ.get('LOG_LEVELS'), str.upper).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+
+    def restart_in_child():
+        # The listener thread (and possibly a held queue lock) does not survive a fork
+        handler.queue = listener.queue = queue.Queue(QUEUE_SIZE)
+        listener._thread = None
+        listener.start()
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=restart_in_child)
+    return listener
+
@@ -0,0 +1,239 @@
+"""
+Request and SQL metrics for NFL PickEm
+Every request records its latency, status code and the SQLite statements it
+ran (count and time). The statements are counted by a cursor class that the
+pooled connections are created with, so no route needs to be touched.
+/metrics renders everything in the Prometheus text format; each worker
+process reports its own counters (scrape every worker, or aggregate on the
+pid label).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Statements per request; a route climbing the high buckets is an N+1 pattern
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500, 1000)
+
+# Route label for statements run outside a request (job worker, scheduler, broker)
+BACKGROUND = '(background)'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.sum += value
+
+    def samples(self):
+        """(le, cumulative count) pairs ending with +Inf"""
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports every statement and the time spent stepping it"""
+
+    # [sql, parameters, seconds so far] of the running statement, tracked only for the slow-query log
+    _statement = None
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._timed(time.perf_counter() - started, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._timed(time.perf_counter() - started, sql, None)
+
+    # Rows after the first are produced while fetching; that time belongs to the statement
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._timed(time.perf_counter() - started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._timed(time.perf_counter() - started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._timed(time.perf_counter() - started)
+
+    def _timed(self, seconds, sql=None, parameters=None):
+        metrics = self.connection.metrics
+        metrics.record_sql(seconds, statements=0 if sql is None else 1)
+
+        slow_log = metrics.slow_log
+        if slow_log is None:
+            return
+        if sql is not None:
+            self._statement = [sql, parameters, seconds]
+        elif self._statement is not None:
+            self._statement[2] += seconds
+        else:
+            return
+        if self._statement[2] >= slow_log.threshold:
+            # Logged once per execution, when it crosses the threshold
+            statement, self._statement = self._statement, None
+            slow_log.record(self.connection, *statement)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors (including the execute shortcuts) are TimedCursors"""
+
+    metrics = None  # bound by Metrics.connection_factory
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+class _RouteStats:
+    def __init__(self):
+        self.statuses = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.sql_seconds = 0.0
+
+
+class Metrics:
+    """Per-process registry of request and SQL metrics.
+
+    start_request()/finish_request() bracket a request on its thread; SQL
+    statements in between are charged to that request, all others to the
+    background label.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._routes = {}
+        self._background = [0, 0.0]
+        self.started_at = time.time()
+        # Optional slowlog.SlowQueryLog fed by the same cursors
+        self.slow_log = None
+        # sqlite3.connect(factory=...) takes a class, so bind this registry to one
+        self.connection_factory = type('TimedConnection', (TimedConnection,), {'metrics': self})
+
+    def start_request(self):
+        self._local.request = [time.perf_counter(), 0, 0.0]
+
+    def record_sql(self, seconds, statements=1):
+        current = getattr(self._local, 'request', None)
+        if current is not None:
+            current[1] += statements
+            current[2] += seconds
+        else:
+            with self._lock:
+                self._background[0] += statements
+                self._background[1] += seconds
+
+    def finish_request(self, method, route, status):
+        current = getattr(self._local, 'request', None)
+        if current is None:
+            return
+        self._local.request = None
+        started, statements, sql_seconds = current
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = _RouteStats()
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.latency.observe(elapsed)
+            stats.statements.observe(statements)
+            stats.sql_seconds += sql_seconds
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        pid = os.getpid()
+        with self._lock:
+            routes = sorted(self._routes.items())
+            background = list(self._background)
+
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def labels(**values):
+            return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in values.items()) + "}"
+
+        family('pickem_http_requests_total', 'counter', 'Requests by route and status code')
+        for (method, route), stats in routes:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f"pickem_http_requests_total{labels(pid=pid, method=method, route=route, status=status)} {count}")
+
+        family('pickem_http_request_duration_seconds', 'histogram', 'Request latency by route')
+        for (method, route), stats in routes:
+            _histogram(lines, 'pickem_http_request_duration_seconds', stats.latency,
+                       dict(pid=pid, method=method, route=route), labels)
+
+        family('pickem_sql_statements_per_request', 'histogram', 'SQLite statements executed per request')
+        for (method, route), stats in routes:
+            _histogram(lines, 'pickem_sql_statements_per_request', stats.statements,
+                       dict(pid=pid, method=method, route=route), labels)
+
+        family('pickem_sql_seconds_total', 'counter', 'Time spent executing and fetching SQLite statements')
+        for (method, route), stats in routes:
+            lines.append(f"pickem_sql_seconds_total{labels(pid=pid, method=method, route=route)} {stats.sql_seconds:.6f}")
+        lines.append(f"pickem_sql_seconds_total{labels(pid=pid, method='', route=BACKGROUND)} {background[1]:.6f}")
+
+        family('pickem_sql_statements_total', 'counter', 'SQLite statements executed outside requests')
+        lines.append(f"pickem_sql_statements_total{labels(pid=pid, route=BACKGROUND)} {background[0]}")
+
+        family('pickem_process_start_time_seconds', 'gauge', 'Start time of this worker process')
+        lines.append(f"pickem_process_start_time_seconds{labels(pid=pid)} {self.started_at:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+def _histogram(lines, name, histogram, label_values, labels):
+    for bound, count in histogram.samples():
+        lines.append(f"{name}_bucket{labels(**label_values, le=bound)} {count}")
+    total = histogram.sum
+    lines.append(f"{name}_sum{labels(**label_values)} {total:.6f}" if isinstance(total, float)
+                 else f"{name}_sum{labels(**label_values)} {total}")
+    lines.append(f"{name}_count{labels(**label_values)} {sum(histogram.counts)}")
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
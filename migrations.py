@@ -0,0 +1,398 @@
+"""
+Versioned schema migrations for NFL PickEm
+Brings any database - fresh, created by an older app.py, or one of the legacy
+layouts (setup_database.py's completed/correct columns, the historical
+winner_team_id/loser_team_id layout) - up to the current schema.
+
+    python -m migrations [db_path]            # apply pending migrations
+    python -m migrations [db_path] --explain  # verify hot queries use indexes
+"""
+
+import re
+import sqlite3
+import sys
+
+from eligibility import USAGE_COUNTS_SQL, USER_MASKS_SQL
+from jobs import NEXT_JOB_SQL
+from pick_history import DEFAULT_PAGE_SIZE, RESULT_FILTERS, history_query
+from queries import (
+    HISTORICAL_USAGE_SQL, LEADERBOARD_SQL, PENDING_GAMES_SQL, PICK_TARGET_SQL, RANK_SQL, SCORE_PICKS_SQL,
+    SCORE_STANDINGS_SQL, SCORED_COUNTS_SQL, SCORING_BATCH_SQL, TEAM_USAGE_SQL, USER_STANDING_SQL,
+    USER_WEEK_PICK_ID_SQL, USER_WEEK_PICK_SQL
+)
+from schedule import WEEK_SCHEDULE_SQL
+from scheduler import NEXT_KICKOFF_SQL, STARTED_GAMES_SQL
+from users import FIND_USER_SQL, IS_ADMIN_SQL
+
+# Current layout of every table; {name} is filled in so a table can be
+# rebuilt under a temporary name when converting a legacy layout.
+TABLES = {
+    'users': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            is_admin BOOLEAN NOT NULL DEFAULT 0
+        )
+    """,
+    'teams': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            abbreviation TEXT NOT NULL,
+            logo_url TEXT
+        )
+    """,
+    'matches': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY,
+            week INTEGER NOT NULL,
+            home_team_id INTEGER NOT NULL,
+            away_team_id INTEGER NOT NULL,
+            game_time TEXT NOT NULL,
+            is_completed BOOLEAN DEFAULT FALSE,
+            home_score INTEGER,
+            away_score INTEGER,
+            winner_team_id INTEGER,
+            kickoff_utc INTEGER,
+            kickoff_vienna TEXT,
+            locked BOOLEAN NOT NULL DEFAULT 0
+        )
+    """,
+    'picks': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            match_id INTEGER NOT NULL,
+            team_id INTEGER NOT NULL,
+            week INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            is_correct BOOLEAN
+        )
+    """,
+    'historical_picks': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            week INTEGER NOT NULL,
+            team_name TEXT NOT NULL,
+            team_id INTEGER,
+            is_correct BOOLEAN NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """,
+    'team_usage': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            team_id INTEGER NOT NULL,
+            usage_type TEXT NOT NULL,
+            week INTEGER NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """,
+    'admin_actions': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            admin_user TEXT NOT NULL,
+            action_type TEXT NOT NULL,
+            match_id INTEGER,
+            details TEXT,
+            created_at TEXT NOT NULL
+        )
+    """,
+    'standings': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            user_id INTEGER PRIMARY KEY,
+            points INTEGER NOT NULL DEFAULT 0,
+            picks INTEGER NOT NULL DEFAULT 0,
+            last_updated_week INTEGER NOT NULL DEFAULT 0
+        )
+    """,
+    'team_eligibility': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            user_id INTEGER PRIMARY KEY,
+            loser_mask INTEGER NOT NULL DEFAULT 0,
+            winner_mask INTEGER NOT NULL DEFAULT 0,
+            winner_twice_mask INTEGER NOT NULL DEFAULT 0
+        )
+    """,
+    'events': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """,
+    'jobs': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT
+        )
+    """,
+}
+
+# Legacy column names that hold the data of a current column
+LEGACY_ALIASES = {
+    'matches': {'is_completed': 'completed'},
+    'historical_picks': {'is_correct': 'correct', 'team_id': 'winner_team_id'},
+}
+
+# Values for NOT NULL columns a legacy layout does not have at all
+LEGACY_DEFAULTS = {
+    'matches': {'game_time': "''"},
+    'picks': {'created_at': "''"},
+    'historical_picks': {'team_name': "''", 'is_correct': '0', 'created_at': "''"},
+    'team_usage': {'week': '0', 'created_at': "''"},
+}
+
+
+def _columns(cursor, table):
+    """[(name, notnull)] of a table, empty if it does not exist"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [(row[1], row[3]) for row in cursor.fetchall()]
+
+
+def _m001_baseline(cursor):
+    """Create every table that does not exist yet"""
+    for name, ddl in TABLES.items():
+        cursor.execute(ddl.format(name=name))
+
+
+def _m002_normalize_legacy_layouts(cursor):
+    """Rebuild tables whose columns differ from the current layout"""
+    for table, ddl in TABLES.items():
+        existing = {name for name, _ in _columns(cursor, table)}
+        temp = f"{table}__migrated"
+        cursor.execute(f"DROP TABLE IF EXISTS {temp}")
+        cursor.execute(ddl.format(name=temp))
+        target = _columns(cursor, temp)
+        if existing == {name for name, _ in target}:
+            cursor.execute(f"DROP TABLE {temp}")
+            continue
+
+        aliases = LEGACY_ALIASES.get(table, {})
+        defaults = LEGACY_DEFAULTS.get(table, {})
+        columns, expressions = [], []
+        for name, notnull in target:
+            if name in existing:
+                source = name
+            elif aliases.get(name) in existing:
+                source = aliases[name]
+            else:
+                source = defaults.get(name)
+                if source is None:
+                    continue
+            if notnull and name in defaults:
+                source = f"COALESCE({source}, {defaults[name]})"
+            columns.append(name)
+            expressions.append(source)
+
+        cursor.execute(f"""
+            INSERT INTO {temp} ({", ".join(columns)})
+            SELECT {", ".join(expressions)} FROM {table}
+        """)
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {temp} RENAME TO {table}")
+
+
+def _m003_indexes(cursor):
+    """Composite indexes for every hot query, one pick per user and week"""
+    # Keep only the latest pick per (user, week) before enforcing uniqueness
+    cursor.execute("""
+        DELETE FROM picks WHERE id NOT IN (SELECT MAX(id) FROM picks GROUP BY user_id, week)
+    """)
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_picks_user_week ON picks (user_id, week)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_picks_match ON picks (match_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_week_time ON matches (week, game_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_team_usage_user_type ON team_usage (user_id, usage_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_team_usage_user_team ON team_usage (user_id, team_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_historical_picks_user_week ON historical_picks (user_id, week)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_standings_rank ON standings (points DESC, picks, user_id)")
+
+
+def _m004_user_roles(cursor):
+    """Admin flag as a column instead of a constant in app.py"""
+    if 'is_admin' not in {name for name, _ in _columns(cursor, 'users')}:
+        cursor.execute("ALTER TABLE users ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT 0")
+    # The admin the old ADMIN_USERS constant granted
+    cursor.execute("UPDATE users SET is_admin = 1 WHERE username = 'Manuel'")
+
+
+def _m005_jobs(cursor):
+    """Durable background job queue"""
+    cursor.execute(TABLES['jobs'].format(name='jobs'))
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)")
+
+
+def _m006_kickoff_columns(cursor):
+    """Kickoff as an indexed UTC epoch plus the Vienna display string"""
+    from schedule import kickoff_fields
+
+    existing = {name for name, _ in _columns(cursor, 'matches')}
+    if 'kickoff_utc' not in existing:
+        cursor.execute("ALTER TABLE matches ADD COLUMN kickoff_utc INTEGER")
+    if 'kickoff_vienna' not in existing:
+        cursor.execute("ALTER TABLE matches ADD COLUMN kickoff_vienna TEXT")
+
+    cursor.execute("SELECT id, game_time FROM matches")
+    kickoffs = []
+    for match_id, game_time in cursor.fetchall():
+        try:
+            kickoffs.append(kickoff_fields(game_time) + (match_id,))
+        except (TypeError, ValueError):
+            continue  # unparseable legacy value: the game counts as started
+    cursor.executemany("UPDATE matches SET kickoff_utc = ?, kickoff_vienna = ? WHERE id = ?", kickoffs)
+
+    cursor.execute("DROP INDEX IF EXISTS idx_matches_week_time")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_week_kickoff ON matches (week, kickoff_utc)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_kickoff ON matches (kickoff_utc)")
+
+
+def _m007_pick_locks(cursor):
+    """locked flag flipped at kickoff by the scheduler"""
+    if 'locked' not in {name for name, _ in _columns(cursor, 'matches')}:
+        cursor.execute("ALTER TABLE matches ADD COLUMN locked BOOLEAN NOT NULL DEFAULT 0")
+    # Games that already started (or have no usable kickoff) are closed
+    cursor.execute("""
+        UPDATE matches SET locked = 1
+        WHERE kickoff_utc IS NULL OR kickoff_utc <= CAST(strftime('%s', 'now') AS INTEGER)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_locked_kickoff ON matches (locked, kickoff_utc)")
+
+
+def _m008_pick_history_indexes(cursor):
+    """Week-ordered indexes for the paginated pick history"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_picks_week ON picks (week, user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_historical_picks_week ON historical_picks (week, user_id)")
+
+
+# Ordered migrations; never edit an applied one, append a new one instead
+MIGRATIONS = [
+    (1, 'baseline schema', _m001_baseline),
+    (2, 'normalize legacy layouts', _m002_normalize_legacy_layouts),
+    (3, 'indexes for hot queries', _m003_indexes),
+    (4, 'user roles', _m004_user_roles),
+    (5, 'job queue', _m005_jobs),
+    (6, 'kickoff columns', _m006_kickoff_columns),
+    (7, 'pick locks', _m007_pick_locks),
+    (8, 'pick history indexes', _m008_pick_history_indexes),
+]
+
+
+def current_version(cursor):
+    cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL, name TEXT NOT NULL, applied_at TEXT NOT NULL)")
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def migrate(conn):
+    """Apply all pending migrations in one write transaction.
+
+    Returns [(version, name)] of the migrations that were applied.
+    """
+    cursor = conn.cursor()
+    if conn.in_transaction:
+        conn.commit()
+    # IMMEDIATE takes the write lock up front so concurrent starters serialize
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        version = current_version(cursor)
+        applied = []
+        for number, name, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            apply(cursor)
+            cursor.execute("""
+                INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, datetime('now'))
+            """, (number, name))
+            applied.append((number, name))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
+
+
+# Hot queries that must be served from an index (placeholders bound to 1).
+# The statements are the ones the code runs, imported from where they live.
+HOT_QUERIES = {
+    'matches for week': WEEK_SCHEDULE_SQL,
+    'pick target': PICK_TARGET_SQL,
+    'user pick for week': USER_WEEK_PICK_SQL,
+    'existing pick for week': USER_WEEK_PICK_ID_SQL,
+    'next kickoff': NEXT_KICKOFF_SQL,
+    'started unlocked games': STARTED_GAMES_SQL,
+    'pending games': PENDING_GAMES_SQL,
+    'user usage grouped': USAGE_COUNTS_SQL,
+    'user eligibility': USER_MASKS_SQL,
+    'leaderboard': LEADERBOARD_SQL,
+    'user standing': USER_STANDING_SQL,
+    'dashboard rank': RANK_SQL,
+    'dashboard team usage': TEAM_USAGE_SQL,
+    'dashboard historical usage': HISTORICAL_USAGE_SQL,
+    'login lookup': FIND_USER_SQL,
+    'admin check': IS_ADMIN_SQL,
+    'pick history page': history_query([], [], (1, '', 0), DEFAULT_PAGE_SIZE + 1)[0],
+    'pick history page, filtered': history_query(
+        ['user_id = ?', 'week >= ?', 'week <= ?', 'team_id = ?', RESULT_FILTERS['correct']],
+        [1, 1, 1, 1], (1, '', 0), DEFAULT_PAGE_SIZE + 1)[0],
+    'scoring standings delta': SCORE_STANDINGS_SQL,
+    'scoring picks': SCORE_PICKS_SQL,
+    'scored pick counts': SCORED_COUNTS_SQL,
+    'next queued job': NEXT_JOB_SQL,
+}
+
+
+def _placeholder_params(sql):
+    """Parameters binding every placeholder of sql to 1"""
+    names = re.findall(r':(\w+)', sql)
+    return {name: 1 for name in names} if names else (1,) * sql.count('?')
+
+
+def check_query_plans(conn):
+    """EXPLAIN QUERY PLAN every hot query.
+
+    Returns [(name, plan_lines, uses_index)]; a query passes when no step
+    scans a table without an index.
+    """
+    # A plain cursor, like slowlog.explain: the check is neither timed nor in the slow-query log
+    cursor = conn.cursor(sqlite3.Cursor)
+    cursor.execute(SCORING_BATCH_SQL)
+    results = []
+    for name, sql in HOT_QUERIES.items():
+        plan = [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", _placeholder_params(sql))]
+        uses_index = all(
+            'USING' in step for step in plan if step.startswith('SCAN') and 'CONSTANT ROW' not in step
+        )
+        results.append((name, plan, uses_index))
+    return results
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    db_path = args[0] if args else 'nfl_pickem.db'
+    conn = sqlite3.connect(db_path)
+
+    for number, name in migrate(conn):
+        print(f"✅ Applied migration {number}: {name}")
+    print(f"📦 Schema version: {current_version(conn.cursor())}")
+
+    if '--explain' in sys.argv:
+        failures = 0
+        for name, plan, uses_index in check_query_plans(conn):
+            print(f"{'✅' if uses_index else '❌'} {name}")
+            for step in plan:
+                print(f"      {step}")
+            failures += not uses_index
+        conn.close()
+        sys.exit(1 if failures else 0)
+    conn.close()
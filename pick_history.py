@@ -0,0 +1,141 @@
+"""
+Pick history for /api/all-picks
+Historical and current picks merged in SQL, ordered by (week, username) and
+read page by page with a keyset cursor. Filters are pushed into both halves
+of the UNION so they hit the (user_id, week) and (week, user_id) indexes, and
+SQLite only ever sorts one week's picks to fill a page - memory stays flat no
+matter how big the league is.
+"""
+
+import base64
+import binascii
+import json
+
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+# Rows fetched per round trip when streaming
+STREAM_CHUNK = 500
+
+RESULT_FILTERS = {
+    'correct': "is_correct = 1",
+    'incorrect': "is_correct = 0",
+    'pending': "is_correct IS NULL",
+}
+
+
+class InvalidQuery(ValueError):
+    """A filter or cursor the client sent cannot be used"""
+
+
+def encode_cursor(week, username, source):
+    raw = json.dumps([week, username, source], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        week, username, source = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidQuery("Ungültiger Cursor")
+    if not isinstance(week, int) or not isinstance(username, str) or source not in (0, 1):
+        raise InvalidQuery("Ungültiger Cursor")
+    return week, username, source
+
+
+def parse_filters(cursor, teams, args):
+    """Turn request args into (conditions, params) applied to both pick tables.
+
+    Unknown users or teams match nothing rather than raising.
+    """
+    conditions, params = [], []
+
+    username = args.get('user')
+    if username:
+        cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+        row = cursor.fetchone()
+        conditions.append("user_id = ?")
+        params.append(row[0] if row else -1)
+
+    for name, operator in (('week_from', '>='), ('week_to', '<=')):
+        value = args.get(name)
+        if value is not None:
+            try:
+                params.append(int(value))
+            except ValueError:
+                raise InvalidQuery(f"Ungültiger Wert für {name}")
+            conditions.append(f"week {operator} ?")
+
+    team = args.get('team')
+    if team:
+        match = teams.find(team)
+        conditions.append("team_id = ?")
+        params.append(match.id if match is not None else -1)
+
+    result = args.get('result')
+    if result:
+        if result not in RESULT_FILTERS:
+            raise InvalidQuery("Ungültiger Ergebnis-Filter")
+        conditions.append(RESULT_FILTERS[result])
+
+    return conditions, params
+
+
+def history_query(conditions, params, after, limit):
+    """SQL and params for one ordered slice of the merged pick history"""
+    where = "".join(f" AND x.{condition}" for condition in conditions)
+    sql = f"""
+        SELECT week, username, source, team, is_correct, created_at FROM (
+            SELECT x.week AS week, u.username AS username, 0 AS source,
+                   x.team_name AS team, x.is_correct AS is_correct, x.created_at AS created_at
+            FROM historical_picks x JOIN users u ON x.user_id = u.id
+            WHERE 1{where}
+            UNION ALL
+            SELECT x.week, u.username, 1, CAST(x.team_id AS TEXT), x.is_correct, x.created_at
+            FROM picks x JOIN users u ON x.user_id = u.id
+            WHERE 1{where}
+        )
+    """
+    all_params = params + params
+    if after is not None:
+        sql += " WHERE (week, username, source) > (?, ?, ?)"
+        all_params += list(after)
+    sql += " ORDER BY week, username, source"
+    if limit is not None:
+        sql += " LIMIT ?"
+        all_params.append(limit)
+    return sql, all_params
+
+
+def _pick_dict(teams, week, username, source, team, is_correct, created_at):
+    # Historical picks carry the team name, current picks the team id (as text:
+    # both UNION arms need the same column affinity to merge on the week indexes)
+    if source == 1:
+        team = teams.name(int(team))
+    if is_correct is None:
+        result = 'Pending'
+    else:
+        result = 'Correct' if is_correct == 1 else 'Incorrect'
+    return {'user': username, 'week': week, 'team': team, 'result': result, 'created_at': created_at}
+
+
+def fetch_page(cursor, teams, conditions, params, after=None, limit=DEFAULT_PAGE_SIZE):
+    """One page of picks plus the cursor of the next page (None on the last page)"""
+    sql, all_params = history_query(conditions, params, after, limit + 1)
+    cursor.execute(sql, all_params)
+    rows = cursor.fetchall()
+    next_cursor = encode_cursor(*rows[limit - 1][:3]) if len(rows) > limit else None
+    return [_pick_dict(teams, *row) for row in rows[:limit]], next_cursor
+
+
+def iter_picks(cursor, teams, conditions, params, after=None, limit=None):
+    """Every matching pick in order, fetched in chunks"""
+    sql, all_params = history_query(conditions, params, after, limit)
+    cursor.execute(sql, all_params)
+    while True:
+        rows = cursor.fetchmany(STREAM_CHUNK)
+        if not rows:
+            return
+        for row in rows:
+            yield _pick_dict(teams, *row)
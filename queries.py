@@ -0,0 +1,87 @@
+"""
+SQL of the request and scoring hot paths in app.py
+Kept out of app.py (which opens the database on import) so that
+migrations.HOT_QUERIES explains exactly the statements the routes run.
+"""
+
+# save_pick: lock state, week and teams of the picked game
+PICK_TARGET_SQL = """
+    SELECT locked OR COALESCE(kickoff_utc <= ?, 1), week, home_team_id, away_team_id
+    FROM matches WHERE id = ?
+"""
+
+USER_WEEK_PICK_SQL = "SELECT match_id, team_id FROM picks WHERE user_id = ? AND week = ?"
+
+USER_WEEK_PICK_ID_SQL = "SELECT id FROM picks WHERE user_id = ? AND week = ?"
+
+USER_STANDING_SQL = "SELECT points, picks FROM standings WHERE user_id = ?"
+
+HISTORICAL_USAGE_SQL = """
+    SELECT team_id, CASE WHEN is_correct = 1 THEN 'winner' ELSE 'loser' END as usage_type
+    FROM historical_picks
+    WHERE user_id = ?
+"""
+
+TEAM_USAGE_SQL = "SELECT team_id, usage_type FROM team_usage WHERE user_id = ?"
+
+# Same ordering as the leaderboard
+RANK_SQL = """
+    SELECT COUNT(*) + 1
+    FROM standings
+    WHERE points > :points
+       OR (points = :points AND picks < :picks)
+       OR (points = :points AND picks = :picks AND user_id < :user_id)
+"""
+
+LEADERBOARD_SQL = """
+    SELECT u.username, s.picks as total_picks, s.points
+    FROM standings s
+    JOIN users u ON s.user_id = u.id
+    ORDER BY s.points DESC, s.picks ASC, s.user_id
+"""
+
+# Games that have kicked off but have no result yet
+PENDING_GAMES_SQL = """
+    SELECT id, week, kickoff_vienna, home_team_id, away_team_id
+    FROM matches
+    WHERE is_completed = 0 AND kickoff_utc <= ?
+    ORDER BY kickoff_utc
+"""
+
+# Winners of the games being scored, one row per game
+SCORING_BATCH_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS scoring_batch (
+        match_id INTEGER PRIMARY KEY,
+        winner_team_id INTEGER NOT NULL
+    )
+"""
+
+# Standings delta between the batch's results and what the picks scored before
+SCORE_STANDINGS_SQL = """
+    UPDATE standings SET
+        points = points + (SELECT COALESCE(SUM((p.team_id = b.winner_team_id) - COALESCE(p.is_correct, 0)), 0)
+                           FROM picks p JOIN temp.scoring_batch b ON b.match_id = p.match_id
+                           WHERE p.user_id = standings.user_id),
+        picks = picks + (SELECT COUNT(*)
+                         FROM picks p JOIN temp.scoring_batch b ON b.match_id = p.match_id
+                         WHERE p.user_id = standings.user_id AND p.is_correct IS NULL),
+        -- The pick's week, like STANDINGS_SELECT, so a rebuild finds no drift
+        last_updated_week = MAX(last_updated_week,
+                                (SELECT MAX(p.week)
+                                 FROM picks p JOIN temp.scoring_batch b ON b.match_id = p.match_id
+                                 WHERE p.user_id = standings.user_id))
+    WHERE user_id IN (SELECT user_id FROM picks WHERE match_id IN (SELECT match_id FROM temp.scoring_batch))
+"""
+
+SCORE_PICKS_SQL = """
+    UPDATE picks
+    SET is_correct = (team_id = (SELECT b.winner_team_id FROM temp.scoring_batch b
+                                 WHERE b.match_id = picks.match_id))
+    WHERE match_id IN (SELECT match_id FROM temp.scoring_batch)
+"""
+
+SCORED_COUNTS_SQL = """
+    SELECT match_id, COUNT(*) FROM picks
+    WHERE match_id IN (SELECT match_id FROM temp.scoring_batch)
+    GROUP BY match_id
+"""
@@ -0,0 +1,154 @@
+"""
+Week schedule cache for NFL PickEm
+The game list of a week (teams, logos, Vienna kickoff, scores) is the same for
+every user until a result changes, so it is built once per week and reused.
+Only the per-user overlay - picks and blocked teams - is computed per request.
+Team names and logos come from the in-memory team registry, not a JOIN.
+Compact schedules carry team ids only; clients resolve them from /api/teams.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import pytz
+
+VIENNA_TZ = pytz.timezone('Europe/Vienna')
+
+# Regular season plus playoffs, full and compact, fits comfortably
+MAX_CACHED_WEEKS = 64
+
+
+def kickoff_fields(game_time):
+    """(UTC epoch seconds, Vienna ISO string) for a kickoff time.
+
+    Naive values are taken as Vienna local time. This is the only place
+    kickoff strings are parsed; everything else reads the stored columns.
+    """
+    kickoff = datetime.fromisoformat(game_time)
+    if kickoff.tzinfo is None:
+        kickoff = VIENNA_TZ.localize(kickoff)
+    else:
+        kickoff = kickoff.astimezone(VIENNA_TZ)
+    return int(kickoff.timestamp()), kickoff.isoformat()
+
+
+def store_kickoffs(cursor, kickoffs):
+    """Set game_time and the derived kickoff columns; kickoffs is [(match_id, game_time)].
+
+    The games are unlocked again; the kickoff scheduler re-locks those that
+    already started.
+    """
+    cursor.executemany("""
+        UPDATE matches SET game_time = ?, kickoff_utc = ?, kickoff_vienna = ?, locked = 0 WHERE id = ?
+    """, [(game_time,) + kickoff_fields(game_time) + (match_id,) for match_id, game_time in kickoffs])
+
+
+WEEK_SCHEDULE_SQL = """
+    SELECT id, week, home_team_id, away_team_id, kickoff_vienna, is_completed,
+           home_score, away_score, locked
+    FROM matches
+    WHERE week = ?
+    ORDER BY kickoff_utc
+"""
+
+
+def _team_dict(team):
+    return {'id': team.id, 'name': team.name, 'abbr': team.abbr, 'logo_url': team.logo_url}
+
+
+def build_week_schedule(cursor, week, teams, compact=False):
+    """Match dicts of a week, ordered by kickoff, exactly as /api/matches returns them.
+
+    compact=True references the teams by id (home_team_id/away_team_id)
+    instead of embedding name, abbreviation and logo of both in every game,
+    leaves out the week (the response carries it once) and the scores of
+    games without a result.
+    """
+    cursor.execute(WEEK_SCHEDULE_SQL, (week,))
+
+    matches = []
+    for row in cursor.fetchall():
+        home, away = teams.get(row[2]), teams.get(row[3])
+        if home is None or away is None:
+            # Same as the old inner JOIN: games with unknown teams are not shown
+            continue
+        if compact:
+            match = {
+                'id': row[0],
+                'home_team_id': home.id,
+                'away_team_id': away.id,
+                'game_time': row[4],
+                'is_completed': bool(row[5]),
+                'locked': bool(row[8])
+            }
+            if row[6] is not None or row[7] is not None:
+                match['home_score'], match['away_score'] = row[6], row[7]
+        else:
+            match = {
+                'id': row[0],
+                'week': row[1],
+                'home_team': _team_dict(home),
+                'away_team': _team_dict(away),
+                'game_time': row[4],
+                'is_completed': bool(row[5]),
+                'home_score': row[6],
+                'away_score': row[7],
+                'locked': bool(row[8])
+            }
+        matches.append(match)
+    return matches
+
+
+class WeekScheduleCache:
+    """Bounded LRU of prebuilt week schedules.
+
+    Full and compact schedules of a week are separate entries. Entries are
+    tagged with the data version they were built from; a version change
+    (results entered by any worker, a re-seed) turns them into misses.
+    invalidate() drops everything at once in this process. Cached lists are
+    shared between requests and must not be modified.
+    """
+
+    def __init__(self, max_weeks=MAX_CACHED_WEEKS):
+        self.max_weeks = max_weeks
+        self._weeks = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, cursor, week, version, teams, compact=False):
+        key = (week, compact)
+        with self._lock:
+            entry = self._weeks.get(key)
+            if entry is not None and entry[0] == version:
+                self._weeks.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        matches = build_week_schedule(cursor, week, teams, compact)
+        with self._lock:
+            self._weeks[key] = (version, matches)
+            self._weeks.move_to_end(key)
+            while len(self._weeks) > self.max_weeks:
+                self._weeks.popitem(last=False)
+                self.evictions += 1
+        return matches
+
+    def invalidate(self):
+        with self._lock:
+            self._weeks.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'weeks_cached': len(self._weeks),
+                'max_weeks': self.max_weeks,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
@@ -0,0 +1,104 @@
+"""
+Kickoff-driven pick locks for NFL PickEm
+A scheduler thread in every app process sleeps until the next kickoff (read
+from the (locked, kickoff_utc) index) and then flips `matches.locked` for
+every game that has started. The UPDATE only touches unlocked games, so when
+several gunicorn workers wake at the same kickoff exactly one of them changes
+rows; that worker publishes the pick_lock events and bumps the data versions.
+"""
+
+import logging
+import time
+
+from events import publish_event
+from forksafe import ForkSafeThread
+
+logger = logging.getLogger(__name__)
+
+# Re-read the next kickoff at least this often (new schedule imports, clock changes)
+RECHECK_INTERVAL = 60
+
+STARTED_GAMES_SQL = """
+    SELECT id, week FROM matches
+    WHERE locked = 0 AND (kickoff_utc <= ? OR kickoff_utc IS NULL)
+    ORDER BY kickoff_utc
+"""
+
+NEXT_KICKOFF_SQL = "SELECT MIN(kickoff_utc) FROM matches WHERE locked = 0"
+
+
+def lock_started_games(cursor, now=None):
+    """Lock every game whose kickoff has passed; returns [(match_id, week)] newly locked"""
+    now = int(time.time()) if now is None else now
+    cursor.execute(STARTED_GAMES_SQL, (now,))
+    started = cursor.fetchall()
+    if started:
+        cursor.executemany("UPDATE matches SET locked = 1 WHERE id = ? AND locked = 0",
+                           [(match_id,) for match_id, _ in started])
+    return started
+
+
+def next_kickoff(cursor):
+    """Epoch of the next kickoff still open for picks, None if every game is locked"""
+    cursor.execute(NEXT_KICKOFF_SQL)
+    return cursor.fetchone()[0]
+
+
+class KickoffScheduler:
+    """Locks games at kickoff on a background thread of this process.
+
+    after_lock(locked) runs after a commit that locked games, with the
+    [(match_id, week)] this process locked, e.g. to bump versions and drop
+    caches.
+    """
+
+    def __init__(self, db_manager, after_lock=None):
+        self.db_manager = db_manager
+        self.after_lock = after_lock
+        self._thread = ForkSafeThread(self._run, 'kickoff-scheduler')
+
+    def ensure_started(self):
+        self._thread.ensure_started()
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def wake(self):
+        """Re-read the next kickoff now (call after the schedule changed)"""
+        self._thread.wake()
+
+    def _run(self):
+        while True:
+            delay = RECHECK_INTERVAL
+            try:
+                delay = self._tick()
+            except Exception as e:
+                logger.error("Kickoff scheduler error: %s", e)
+            self._thread.wait(delay)
+
+    def _tick(self):
+        """Lock started games; returns the seconds until the next kickoff (capped)"""
+        conn = self.db_manager.connection()
+        cursor = conn.cursor()
+        now = time.time()
+
+        upcoming = next_kickoff(cursor)
+        if upcoming is not None and upcoming <= now:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                locked = lock_started_games(cursor, int(now))
+                for match_id, week in locked:
+                    publish_event(cursor, 'pick_lock', {'match_id': match_id, 'week': week})
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            if locked:
+                logger.info("🔒 Locked picks for %s games at kickoff", len(locked))
+                if self.after_lock is not None:
+                    self.after_lock(locked)
+            upcoming = next_kickoff(cursor)
+
+        if upcoming is None:
+            return RECHECK_INTERVAL
+        return min(max(upcoming - time.time(), 0), RECHECK_INTERVAL)
@@ -0,0 +1,100 @@
+"""
+Fast, idempotent seed loader for NFL PickEm
+Loads users, teams, EXACT historical data and the full season schedule from
+seed_data.json with one executemany per table inside a single transaction.
+Kickoff times are stored precomputed in the file, so no timezone work happens
+at load time. Re-running never duplicates rows or overwrites entered results.
+
+    python -m seed [db_path] [--file seed_data.json]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_data.json')
+
+# Load order (teams before matches, users before picks)
+SEED_TABLES = ('users', 'teams', 'matches', 'historical_picks', 'team_usage')
+
+# Tables without a natural primary key in the seed: a row is present when a
+# row with the same key columns exists
+SEED_KEYS = {
+    'historical_picks': ('user_id', 'week'),
+    'team_usage': ('user_id', 'week'),
+}
+
+_cache = {}
+
+
+def load_seed_data(path=SEED_FILE):
+    """Parse the seed file once per process"""
+    if path not in _cache:
+        with open(path, encoding='utf-8') as f:
+            _cache[path] = json.load(f)
+    return _cache[path]
+
+
+def _insert_sql(table, columns):
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(f":{column}" for column in columns)
+    keys = SEED_KEYS.get(table)
+    if keys is None:
+        return f"INSERT OR IGNORE INTO {table} ({column_list}) VALUES ({placeholders})"
+    condition = " AND ".join(f"{key} = :{key}" for key in keys)
+    return (f"INSERT INTO {table} ({column_list}) SELECT {placeholders} "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {condition})")
+
+
+def seed_database(cursor, data=None, tables=SEED_TABLES):
+    """Insert the seed rows that are missing; returns {table: rows inserted}"""
+    data = data or load_seed_data()
+    inserted = {}
+    for table in tables:
+        section = data.get(table)
+        if not section:
+            continue
+        columns = section['columns']
+        before = cursor.connection.total_changes
+        cursor.executemany(_insert_sql(table, columns), [dict(zip(columns, row)) for row in section['rows']])
+        inserted[table] = cursor.connection.total_changes - before
+    return inserted
+
+
+def main(argv):
+    seed_file = argv[argv.index('--file') + 1] if '--file' in argv else SEED_FILE
+    args = [arg for arg in argv if not arg.startswith('--') and arg != seed_file]
+    db_path = args[0] if args else 'nfl_pickem.db'
+
+    from data_version import DataVersions
+    from eligibility import rebuild_team_eligibility
+    from migrations import migrate
+    from scheduler import lock_started_games
+    from standings import rebuild_standings
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    inserted = seed_database(cursor, load_seed_data(seed_file))
+    rebuild_standings(cursor)
+    rebuild_team_eligibility(cursor)
+    lock_started_games(cursor)
+    conn.commit()
+    conn.close()
+
+    # Running app workers drop their caches and ETags for the new data
+    DataVersions(db_path + '-version').reset()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for table, count in inserted.items():
+        print(f"✅ {table}: {count} rows inserted")
+    print(f"🏈 Seed loaded into {db_path} in {elapsed_ms:.1f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
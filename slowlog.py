@@ -0,0 +1,135 @@
+"""
+Slow-query log for NFL PickEm
+A profiling mode (SLOW_QUERY_MS=<threshold>) in which every statement that
+runs on the timed connections is checked against a threshold. Slow ones are
+written to a rotating JSON-lines file with their bound parameters and the
+route that ran them. The first time a statement shape shows up, its
+EXPLAIN QUERY PLAN is captured as well. The latest entries and a per-shape
+summary stay in memory for /api/admin/slow-queries.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_LOG_FILE = 'slow_queries.log'
+MAX_LOG_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+# Entries kept in memory per worker for the admin endpoint
+RECENT_ENTRIES = 200
+
+# Statements that have no query plan worth capturing
+_NO_PLAN = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'PRAGMA', 'CREATE', 'DROP', 'ALTER')
+
+_IN_LIST = re.compile(r"\?(\s*,\s*\?)+")
+
+
+def statement_shape(sql):
+    """SQL with whitespace collapsed and placeholder lists folded, e.g. IN (?, ...)"""
+    return _IN_LIST.sub("?, ...", " ".join(sql.split()))
+
+
+class SlowQueryLog:
+    """Records statements slower than threshold_ms.
+
+    context() names what ran the statement (the route, or a background
+    thread); it is called only for slow statements.
+    """
+
+    def __init__(self, threshold_ms, path=DEFAULT_LOG_FILE, context=None,
+                 max_bytes=MAX_LOG_BYTES, backups=LOG_BACKUPS):
+        self.threshold_ms = threshold_ms
+        self.threshold = threshold_ms / 1000
+        self.path = path
+        self.context = context
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=RECENT_ENTRIES)
+        self._shapes = {}
+
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                      encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        # Own logger so the entries end up only in the slow-query file
+        self._logger = logging.getLogger(f'{__name__}.{id(self)}')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(handler)
+
+    def record(self, conn, sql, parameters, seconds):
+        """Log one slow statement; the plan is captured the first time its shape is seen"""
+        shape = statement_shape(sql)
+        with self._lock:
+            summary = self._shapes.get(shape)
+            first = summary is None
+            if first:
+                summary = self._shapes[shape] = {
+                    'shape': shape, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'plan': None
+                }
+
+        plan = explain(conn, sql, parameters) if first else None
+        entry = {
+            'at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'ms': round(seconds * 1000, 3),
+            'context': self.context() if self.context is not None else None,
+            'pid': os.getpid(),
+            'sql': shape,
+            'params': _jsonable(parameters),
+        }
+        if plan is not None:
+            entry['plan'] = plan
+
+        with self._lock:
+            if plan is not None:
+                summary['plan'] = plan
+            summary['count'] += 1
+            summary['total_ms'] += entry['ms']
+            summary['max_ms'] = max(summary['max_ms'], entry['ms'])
+            self._recent.append(entry)
+        self._logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def recent(self, limit=RECENT_ENTRIES):
+        """Latest slow statements of this worker, newest first"""
+        with self._lock:
+            return list(self._recent)[::-1][:limit]
+
+    def shapes(self):
+        """One summary per statement shape, most total time first"""
+        with self._lock:
+            summaries = [dict(summary, total_ms=round(summary['total_ms'], 3))
+                         for summary in self._shapes.values()]
+        return sorted(summaries, key=lambda summary: summary['total_ms'], reverse=True)
+
+
+def explain(conn, sql, parameters):
+    """EXPLAIN QUERY PLAN lines for a statement, None if it has no plan or cannot be explained"""
+    if sql.lstrip().upper().startswith(_NO_PLAN):
+        return None
+    if parameters is None:
+        parameters = (None,) * sql.count('?')
+    try:
+        # A plain cursor, so explaining is neither timed nor logged itself
+        cursor = conn.cursor(sqlite3.Cursor)
+        return [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+    except sqlite3.Error:
+        return None
+
+
+def _jsonable(parameters):
+    if parameters is None or isinstance(parameters, dict):
+        return parameters
+    return list(parameters)
+
+
+def slow_query_log_from_env(context=None):
+    """SlowQueryLog configured by SLOW_QUERY_MS / SLOW_QUERY_LOG, None when profiling is off"""
+    threshold = os.environ.get('SLOW_QUERY_MS')
+    if not threshold:
+        return None
+    return SlowQueryLog(float(threshold), os.environ.get('SLOW_QUERY_LOG', DEFAULT_LOG_FILE), context)
@@ -0,0 +1,163 @@
+"""
+Read-only in-memory snapshot of the database for NFL PickEm
+Optional (READ_SNAPSHOT=1): every worker keeps a copy of the database in a
+shared-cache memory database, made with the sqlite3 backup API. Read routes
+query the copy while it matches the on-disk data versions; a stale copy is
+rebuilt on a background thread into a new memory database and swapped in, so
+readers never wait for a refresh or a writer. Until the swap they read the
+disk database as before. Writes always go to disk.
+"""
+
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+from forksafe import ForkSafeThread
+
+logger = logging.getLogger(__name__)
+
+# Do not rebuild more often than this during write bursts (reads use the disk meanwhile)
+MIN_REFRESH_INTERVAL = 1.0
+
+_generations = itertools.count(1)
+
+
+class _ThreadConnection:
+    """A thread's reader connection; closed when the thread ends and its local storage goes"""
+
+    __slots__ = ('generation', 'conn', '__weakref__')
+
+    def __init__(self, generation, conn):
+        self.generation = generation
+        self.conn = conn
+        weakref.finalize(self, conn.close)
+
+
+def snapshot_enabled():
+    return os.environ.get('READ_SNAPSHOT', '').lower() in ('1', 'true', 'yes')
+
+
+class ReadSnapshot:
+    """Per-process in-memory copy of db_path, tagged with a data version.
+
+    version() returns the current on-disk data version (e.g. a DataVersions
+    read, no query). connection(version) hands out this thread's read-only
+    connection to the copy, or None when the copy is older than `version`
+    (and schedules a refresh).
+    """
+
+    def __init__(self, db_path, version, min_interval=MIN_REFRESH_INTERVAL, factory=sqlite3.Connection):
+        self.db_path = db_path
+        self.version = version
+        self.factory = factory
+        self.min_interval = min_interval
+        self._current = None   # (generation, version, holder connection)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = ForkSafeThread(self._run, 'read-snapshot')
+        self.refreshes = self.failures = 0
+        self.reads = self.fallbacks = 0
+        self.last_refresh_ms = self.max_refresh_ms = self.total_refresh_ms = 0.0
+        self.last_refresh_at = None
+        self.pages = self.size_bytes = 0
+
+    def ensure_started(self):
+        self._thread.ensure_started()
+
+    def connection(self, version):
+        """This thread's connection to the copy if it is at `version`, else None"""
+        current = self._current
+        if current is None or current[1] != version:
+            self.fallbacks += 1
+            self._thread.wake()
+            return None
+
+        generation, _, _ = current
+        local = getattr(self._local, 'conn', None)
+        if local is None or local.generation != generation:
+            # Replacing the old one closes it, which lets an outdated copy go
+            conn = sqlite3.connect(self._uri(generation), uri=True, check_same_thread=False, factory=self.factory)
+            conn.execute("PRAGMA query_only = ON")
+            local = _ThreadConnection(generation, conn)
+            self._local.conn = local
+        self.reads += 1
+        return local.conn
+
+    def refresh(self):
+        """Copy the disk database into a new generation and swap it in; returns the seconds taken"""
+        with self._refresh_lock:
+            # Read the version first: the copy is at least that new
+            version = self.version()
+            generation = next(_generations)
+            started = time.perf_counter()
+
+            target = sqlite3.connect(self._uri(generation), uri=True, check_same_thread=False)
+            try:
+                source = sqlite3.connect(self.db_path)
+                try:
+                    source.backup(target)
+                finally:
+                    source.close()
+                pages = target.execute("PRAGMA page_count").fetchone()[0]
+                page_size = target.execute("PRAGMA page_size").fetchone()[0]
+            except Exception:
+                target.close()
+                raise
+
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                previous, self._current = self._current, (generation, version, target)
+                self.refreshes += 1
+                self.last_refresh_ms = elapsed * 1000
+                self.max_refresh_ms = max(self.max_refresh_ms, self.last_refresh_ms)
+                self.total_refresh_ms += self.last_refresh_ms
+                self.last_refresh_at = time.time()
+                self.pages, self.size_bytes = pages, pages * page_size
+            # Readers still on the old copy keep it alive through their own connections
+            if previous is not None:
+                previous[2].close()
+
+        logger.info("📸 Read snapshot refreshed: %s pages (%s KiB) in %.1fms",
+                    pages, pages * page_size // 1024, elapsed * 1000)
+        return elapsed
+
+    def stats(self):
+        with self._lock:
+            current = self._current
+            requests = self.reads + self.fallbacks
+            return {
+                'generation': current[0] if current else None,
+                'current': current is not None and current[1] == self.version(),
+                'age_seconds': round(time.time() - self.last_refresh_at, 1) if self.last_refresh_at else None,
+                'refreshes': self.refreshes,
+                'failures': self.failures,
+                'last_refresh_ms': round(self.last_refresh_ms, 3),
+                'max_refresh_ms': round(self.max_refresh_ms, 3),
+                'avg_refresh_ms': round(self.total_refresh_ms / self.refreshes, 3) if self.refreshes else 0.0,
+                'pages': self.pages,
+                'size_bytes': self.size_bytes,
+                'reads': self.reads,
+                'fallbacks': self.fallbacks,
+                'hit_rate': round(self.reads / requests, 4) if requests else 0.0
+            }
+
+    def _uri(self, generation):
+        return f"file:pickem-snapshot-{os.getpid()}-{generation}?mode=memory&cache=shared"
+
+    def _run(self):
+        while True:
+            self._thread.wait()
+            current = self._current
+            if current is not None and current[1] == self.version():
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                self.failures += 1
+                logger.error("Read snapshot refresh error: %s", e)
+            time.sleep(self.min_interval)
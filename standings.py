@@ -0,0 +1,48 @@
+"""
+Materialized standings for NFL PickEm
+One row per user (points, scored picks, last scored week) so the leaderboard
+and dashboard rank are indexed reads instead of joins over every pick.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Standings (points / scored picks per user) recomputed from the source tables.
+# Historical picks always count; current picks only once they are scored.
+STANDINGS_SELECT = """
+    SELECT u.id,
+           (SELECT COUNT(*) FROM historical_picks hp WHERE hp.user_id = u.id AND hp.is_correct = 1) +
+           (SELECT COUNT(*) FROM picks p WHERE p.user_id = u.id AND p.is_correct = 1) as points,
+           (SELECT COUNT(*) FROM historical_picks hp WHERE hp.user_id = u.id) +
+           (SELECT COUNT(*) FROM picks p WHERE p.user_id = u.id AND p.is_correct IS NOT NULL) as picks,
+           MAX(COALESCE((SELECT MAX(hp.week) FROM historical_picks hp WHERE hp.user_id = u.id), 0),
+               COALESCE((SELECT MAX(p.week) FROM picks p
+                         WHERE p.user_id = u.id AND p.is_correct IS NOT NULL), 0)) as last_updated_week
+    FROM users u
+"""
+
+
+def refresh_user_standing(cursor, user_id):
+    """Recompute the standings row of a single user"""
+    cursor.execute(f"INSERT OR REPLACE INTO standings (user_id, points, picks, last_updated_week) "
+                   f"{STANDINGS_SELECT} WHERE u.id = ?", (user_id,))
+
+
+def rebuild_standings(cursor):
+    """Recompute all standings from scratch; returns the number of rows that had drifted"""
+    cursor.execute(STANDINGS_SELECT)
+    fresh = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    cursor.execute("SELECT user_id, points, picks, last_updated_week FROM standings")
+    current = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    drifted = [user_id for user_id in fresh.keys() | current.keys() if fresh.get(user_id) != current.get(user_id)]
+    if drifted and current:
+        logger.warning("Standings drifted for %s users, rebuilding", len(drifted))
+    
+    cursor.execute("DELETE FROM standings")
+    cursor.executemany("""
+        INSERT INTO standings (user_id, points, picks, last_updated_week) VALUES (?, ?, ?, ?)
+    """, [(user_id,) + values for user_id, values in fresh.items()])
+    return len(drifted)
@@ -0,0 +1,563 @@
+let isAdmin = false;
+let pendingGames = [];
+let currentWeek = 3;
+let availableWeeks = [];
+const etagCache = new Map();
+let teamsById = null;
+let teamsVersion = null;
+
+// GET JSON and revalidate with the stored ETag; a 304 reuses the cached body
+function cachedFetch(url) {
+    const cached = etagCache.get(url);
+    const headers = cached ? { 'If-None-Match': cached.etag } : {};
+
+    return fetch(url, { headers: headers })
+        .then(response => {
+            if (response.status === 304 && cached) {
+                return cached.data;
+            }
+            return response.json().then(data => {
+                const etag = response.headers.get('ETag');
+                if (etag && data.success) {
+                    etagCache.set(url, { etag: etag, data: data });
+                }
+                return data;
+            });
+        });
+}
+
+// Team reference data, once per version (the versioned URL stays in the browser cache)
+function loadTeams(version) {
+    if (teamsById && teamsVersion === version) {
+        return Promise.resolve(teamsById);
+    }
+    return fetch(`/api/teams?v=${version}`)
+        .then(response => response.json())
+        .then(data => {
+            teamsById = {};
+            data.teams.forEach(team => { teamsById[team.id] = team; });
+            teamsVersion = version;
+            return teamsById;
+        });
+}
+
+// Compact matches only carry team ids; cached responses are shared, so copy
+function withTeams(match, teams) {
+    return Object.assign({}, match, {
+        home_team: teams[match.home_team_id],
+        away_team: teams[match.away_team_id]
+    });
+}
+
+// Login function
+function login() {
+    const username = document.getElementById('username').value.trim();
+
+    if (!username) {
+        alert('Bitte wähle einen Namen aus.');
+        return;
+    }
+
+    fetch('/api/login', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ username: username })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            isAdmin = data.is_admin;
+            document.getElementById('login-section').style.display = 'none';
+            document.getElementById('main-app').style.display = 'block';
+            document.getElementById('user-info').textContent = `Willkommen, ${username}!`;
+
+            showAdminTab();
+            loadBootstrap();
+            loadPendingGames();
+            connectStream();
+        } else {
+            alert(data.message);
+        }
+    })
+    .catch(error => {
+        console.error('Login error:', error);
+        alert('Login-Fehler');
+    });
+}
+
+// Live updates via Server-Sent Events instead of re-polling
+let eventSource = null;
+
+function isTabActive(tabName) {
+    return document.getElementById(tabName).classList.contains('active');
+}
+
+// Without a stream (the server answers 503 when its stream slots are full)
+// the visible data is revalidated with ETags instead, mostly as cheap 304s
+const POLL_INTERVAL_MS = 30000;
+const STREAM_RETRY_MS = 5 * 60 * 1000;
+let pollTimer = null;
+
+function refreshVisible() {
+    if (document.hidden) return;
+    loadDashboard();
+    loadPendingGames();
+    if (isTabActive('leaderboard')) loadLeaderboard();
+    if (isTabActive('picks')) loadMatches();
+    if (isTabActive('all-picks')) loadAllPicks();
+}
+
+function startPolling() {
+    if (!pollTimer) pollTimer = setInterval(refreshVisible, POLL_INTERVAL_MS);
+}
+
+function stopPolling() {
+    if (pollTimer) {
+        clearInterval(pollTimer);
+        pollTimer = null;
+    }
+}
+
+function connectStream() {
+    if (eventSource) return;
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+
+    eventSource = new EventSource('/api/stream');
+
+    eventSource.addEventListener('open', stopPolling);
+
+    // Network errors reconnect by themselves; a refused stream is closed for good
+    eventSource.addEventListener('error', () => {
+        if (eventSource && eventSource.readyState === EventSource.CLOSED) {
+            eventSource = null;
+            startPolling();
+            setTimeout(connectStream, STREAM_RETRY_MS);
+        }
+    });
+
+    eventSource.addEventListener('result', () => {
+        loadPendingGames();
+        if (isTabActive('picks')) loadMatches();
+        if (isTabActive('all-picks')) loadAllPicks();
+    });
+
+    eventSource.addEventListener('standings', () => {
+        loadDashboard();
+        if (isTabActive('leaderboard')) loadLeaderboard();
+    });
+
+    eventSource.addEventListener('pick', () => {
+        if (isTabActive('all-picks')) loadAllPicks();
+    });
+
+    eventSource.addEventListener('pick_lock', event => {
+        const lock = JSON.parse(event.data);
+        const week = document.getElementById('week-select').value || currentWeek;
+        if (isTabActive('picks') && lock.week === parseInt(week)) loadMatches();
+    });
+}
+
+// Logout function
+function logout() {
+    if (eventSource) eventSource.close();
+    stopPolling();
+    fetch('/api/logout', {
+        method: 'POST'
+    })
+    .then(() => {
+        location.reload();
+    });
+}
+
+// Show tab function
+function showTab(tabName) {
+    // Hide all tabs
+    const tabs = document.querySelectorAll('.tab-content');
+    tabs.forEach(tab => tab.classList.remove('active'));
+
+    // Remove active class from nav links
+    const navLinks = document.querySelectorAll('.nav-tabs a');
+    navLinks.forEach(link => link.classList.remove('active'));
+
+    // Show selected tab
+    document.getElementById(tabName).classList.add('active');
+
+    // Add active class to clicked nav link
+    event.target.classList.add('active');
+
+    // Load data for specific tabs
+    if (tabName === 'leaderboard') {
+        loadLeaderboard();
+    } else if (tabName === 'all-picks') {
+        loadAllPicks();
+    } else if (tabName === 'picks') {
+        loadMatches();
+    }
+}
+
+// Show admin tab if user is admin
+function showAdminTab() {
+    if (isAdmin) {
+        const adminTab = document.createElement('li');
+        adminTab.innerHTML = '<a href="#" onclick="showTab(\'admin-panel\')">🔧 Admin</a>';
+        document.querySelector('.nav-tabs').appendChild(adminTab);
+    }
+}
+
+// Initial state in one request: dashboard, weeks, this week's games and the leaderboard
+function loadBootstrap() {
+    fetch('/api/bootstrap')
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                throw new Error(data.message);
+            }
+            const sections = data.sections;
+            // Later loads of the same URLs revalidate against these ETags
+            Object.values(sections).forEach(section => {
+                if (section.etag) {
+                    etagCache.set(section.url, { etag: section.etag, data: section.data });
+                }
+            });
+
+            renderDashboard(sections.dashboard.data);
+            renderAvailableWeeks(sections.available_weeks.data);
+            renderLeaderboard(sections.leaderboard.data);
+            const matches = sections.matches.data;
+            return matches.success
+                ? loadTeams(matches.teams_version).then(teams => renderMatches(matches, teams))
+                : renderMatches(matches, {});
+        })
+        .catch(error => {
+            console.error('Bootstrap error:', error);
+            // One request at a time, as before
+            loadDashboard();
+            loadAvailableWeeks();
+        });
+}
+
+// Load dashboard data
+function loadDashboard() {
+    cachedFetch('/api/dashboard')
+        .then(renderDashboard)
+        .catch(error => console.error('Dashboard error:', error));
+}
+
+function renderDashboard(data) {
+    if (data.success) {
+        document.getElementById('current-week').textContent = data.current_week;
+        document.getElementById('total-points').textContent = data.total_points;
+        document.getElementById('success-rate').textContent = `${data.correct_picks}/${data.total_picks}`;
+        document.getElementById('current-rank').textContent = data.rank;
+
+        // Update team usage
+        const winnerTeams = document.getElementById('winner-teams');
+        winnerTeams.innerHTML = '';
+        data.winner_teams.forEach(team => {
+            const badge = document.createElement('span');
+            badge.className = 'team-badge winner';
+            badge.textContent = team;
+            winnerTeams.appendChild(badge);
+        });
+
+        const loserTeams = document.getElementById('loser-teams');
+        loserTeams.innerHTML = '';
+        if (data.loser_teams.length === 0) {
+            loserTeams.innerHTML = '<span class="team-badge">Keine Teams eliminiert</span>';
+        } else {
+            data.loser_teams.forEach(team => {
+                const badge = document.createElement('span');
+                badge.className = 'team-badge loser';
+                badge.textContent = team;
+                loserTeams.appendChild(badge);
+            });
+        }
+    }
+}
+
+// Load available weeks
+function loadAvailableWeeks() {
+    cachedFetch('/api/available-weeks')
+        .then(renderAvailableWeeks)
+        .catch(error => console.error('Available weeks error:', error));
+}
+
+function renderAvailableWeeks(data) {
+    if (data.success) {
+        availableWeeks = data.weeks;
+        const select = document.getElementById('week-select');
+        select.innerHTML = '';
+
+        data.weeks.forEach(week => {
+            const option = document.createElement('option');
+            option.value = week.week;
+            const statusIcon = week.status === 'completed' ? '✅' : 
+                             week.status === 'active' ? '🔄' : '⏳';
+            option.textContent = `Woche ${week.week} ${statusIcon}`;
+            if (week.week === data.current_week) {
+                option.selected = true;
+            }
+            select.appendChild(option);
+        });
+
+        currentWeek = data.current_week;
+    }
+}
+
+// Load matches for selected week
+function loadMatches() {
+    const week = document.getElementById('week-select').value || currentWeek;
+
+    cachedFetch(`/api/matches?week=${week}&compact=1`)
+        .then(data => data.success
+            ? loadTeams(data.teams_version).then(teams => ({ data: data, teams: teams }))
+            : { data: data, teams: {} })
+        .then(({ data, teams }) => renderMatches(data, teams))
+        .catch(error => {
+            console.error('Matches error:', error);
+            document.getElementById('matches-container').innerHTML = 
+                '<div class="alert alert-danger">Fehler beim Laden der Spiele</div>';
+        });
+}
+
+function renderMatches(data, teams) {
+    const container = document.getElementById('matches-container');
+
+    if (data.success) {
+        container.innerHTML = '';
+
+        if (data.matches.length === 0) {
+            container.innerHTML = '<div class="alert alert-info">Keine Spiele für diese Woche gefunden.</div>';
+            return;
+        }
+
+        data.matches.forEach(match => {
+            const matchCard = createMatchCard(withTeams(match, teams), data.picks, data.unpickable_teams, data.unpickable_reasons || {});
+            container.appendChild(matchCard);
+        });
+    } else {
+        container.innerHTML = `<div class="alert alert-danger">${data.message}</div>`;
+    }
+}
+
+// Create match card
+function createMatchCard(match, picks, unpickableTeams, unpickableReasons) {
+    const card = document.createElement('div');
+    card.className = 'match-card';
+
+    const gameTime = new Date(match.game_time).toLocaleString('de-DE');
+    const isCompleted = match.is_completed;
+    const isLocked = isCompleted || match.locked;
+    const userPick = picks[match.id];
+
+    card.innerHTML = `
+        <div class="match-teams">
+            <div class="team">
+                <img src="${match.away_team.logo_url}" alt="${match.away_team.name}" onerror="this.style.display='none'">
+                <span>${match.away_team.name}</span>
+                ${isCompleted ? `<strong>(${match.away_score || 0})</strong>` : ''}
+            </div>
+            <div class="vs">@</div>
+            <div class="team">
+                <img src="${match.home_team.logo_url}" alt="${match.home_team.name}" onerror="this.style.display='none'">
+                <span>${match.home_team.name}</span>
+                ${isCompleted ? `<strong>(${match.home_score || 0})</strong>` : ''}
+            </div>
+        </div>
+        <div class="match-info">
+            ${gameTime}
+            ${isCompleted ? '<br><strong>Spiel beendet</strong>' : isLocked ? '<br><strong>🔒 Gesperrt</strong>' : ''}
+        </div>
+        <div class="pick-buttons">
+            <button class="pick-btn ${userPick === match.away_team.id ? 'selected' : ''} 
+                           ${unpickableTeams.includes(match.away_team.id) || isLocked ? 'disabled' : ''}"
+                    onclick="makePick(${match.id}, ${match.away_team.id}, ${document.getElementById('week-select').value})"
+                    ${unpickableTeams.includes(match.away_team.id) || isLocked ? 'disabled' : ''}
+                    title="${unpickableTeams.includes(match.away_team.id) ? unpickableReasons[match.away_team.id] || 'Nicht verfügbar' : ''}">
+                ${match.away_team.name}
+                ${unpickableTeams.includes(match.away_team.id) ? `<br><small>(${unpickableReasons[match.away_team.id] || 'Nicht verfügbar'})</small>` : ''}
+            </button>
+            <button class="pick-btn ${userPick === match.home_team.id ? 'selected' : ''} 
+                           ${unpickableTeams.includes(match.home_team.id) || isLocked ? 'disabled' : ''}"
+                    onclick="makePick(${match.id}, ${match.home_team.id}, ${document.getElementById('week-select').value})"
+                    ${unpickableTeams.includes(match.home_team.id) || isLocked ? 'disabled' : ''}
+                    title="${unpickableTeams.includes(match.home_team.id) ? unpickableReasons[match.home_team.id] || 'Nicht verfügbar' : ''}">
+                ${match.home_team.name}
+                ${unpickableTeams.includes(match.home_team.id) ? `<br><small>(${unpickableReasons[match.home_team.id] || 'Nicht verfügbar'})</small>` : ''}
+            </button>
+        </div>
+    `;
+
+    return card;
+}
+
+// Make pick
+function makePick(matchId, teamId, week) {
+    fetch('/api/picks', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            match_id: matchId,
+            team_id: teamId,
+            week: parseInt(week)
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            loadMatches(); // Reload matches to show updated pick
+            loadDashboard(); // Update dashboard
+        } else {
+            alert(data.message);
+        }
+    })
+    .catch(error => {
+        console.error('Pick error:', error);
+        alert('Fehler beim Speichern des Picks');
+    });
+}
+
+// Load leaderboard
+function loadLeaderboard() {
+    cachedFetch('/api/leaderboard')
+        .then(renderLeaderboard)
+        .catch(error => console.error('Leaderboard error:', error));
+}
+
+function renderLeaderboard(data) {
+    if (data.success) {
+        const tbody = document.getElementById('leaderboard-body');
+        tbody.innerHTML = '';
+
+        data.leaderboard.forEach(player => {
+            const row = document.createElement('tr');
+            row.innerHTML = `
+                <td><span class="rank-badge">${player.rank}</span></td>
+                <td>${player.username}</td>
+                <td>${player.points}</td>
+                <td>${player.correct_picks}/${player.total_picks}</td>
+            `;
+            tbody.appendChild(row);
+        });
+    }
+}
+
+// Load all picks
+// Pages are keyed by the server's cursor; "Mehr laden" appends the next one
+let allPicksCursor = null;
+
+function loadAllPicks(cursor) {
+    const url = cursor ? `/api/all-picks?cursor=${encodeURIComponent(cursor)}` : '/api/all-picks';
+    cachedFetch(url)
+        .then(data => {
+            if (data.success) {
+                const tbody = document.getElementById('all-picks-body');
+                if (!cursor) tbody.innerHTML = '';
+                allPicksCursor = data.next_cursor;
+                document.getElementById('all-picks-more').style.display = allPicksCursor ? 'inline-block' : 'none';
+
+                data.picks.forEach(pick => {
+                    const row = document.createElement('tr');
+                    const resultClass = pick.result === 'Correct' ? 'text-success' : 
+                                      pick.result === 'Incorrect' ? 'text-danger' : '';
+                    row.innerHTML = `
+                        <td>${pick.user}</td>
+                        <td>W${pick.week}</td>
+                        <td>${pick.team}</td>
+                        <td class="${resultClass}">${pick.result}</td>
+                    `;
+                    tbody.appendChild(row);
+                });
+            }
+        })
+        .catch(error => console.error('All picks error:', error));
+}
+
+// Admin functions
+function loadPendingGames() {
+    if (!isAdmin) return;
+
+    fetch('/api/admin/pending-games')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                pendingGames = data.pending_games;
+                const select = document.getElementById('pending-games');
+                select.innerHTML = '<option value="">-- Spiel auswählen --</option>';
+
+                pendingGames.forEach(game => {
+                    const option = document.createElement('option');
+                    option.value = game.id;
+                    option.textContent = game.display;
+                    select.appendChild(option);
+                });
+            }
+        })
+        .catch(error => console.error('Error loading pending games:', error));
+}
+
+// Set game result
+document.addEventListener('DOMContentLoaded', function() {
+    const setResultBtn = document.getElementById('set-result-btn');
+    if (setResultBtn) {
+        setResultBtn.addEventListener('click', function() {
+            const matchId = document.getElementById('pending-games').value;
+            const awayScore = parseInt(document.getElementById('away-score').value);
+            const homeScore = parseInt(document.getElementById('home-score').value);
+
+            if (!matchId || isNaN(awayScore) || isNaN(homeScore)) {
+                showAdminResult('Bitte alle Felder ausfüllen', 'error');
+                return;
+            }
+
+            fetch('/api/admin/set-result', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    match_id: parseInt(matchId),
+                    home_score: homeScore,
+                    away_score: awayScore
+                })
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    showAdminResult(`✅ ${data.message}\n🤖 User-Picks werden im Hintergrund ausgewertet (Job #${data.job_id})`, 'success');
+                    // Clear form
+                    document.getElementById('pending-games').value = '';
+                    document.getElementById('away-score').value = '';
+                    document.getElementById('home-score').value = '';
+                    // Reload data
+                    loadPendingGames();
+                    loadDashboard();
+                } else {
+                    showAdminResult(`❌ ${data.message}`, 'error');
+                }
+            })
+            .catch(error => {
+                console.error('Error setting result:', error);
+                showAdminResult('❌ Fehler beim Setzen des Ergebnisses', 'error');
+            });
+        });
+    }
+});
+
+function showAdminResult(message, type) {
+    const resultDiv = document.getElementById('admin-result');
+    resultDiv.textContent = message;
+    resultDiv.className = `alert alert-${type === 'success' ? 'success' : 'danger'}`;
+    resultDiv.style.display = 'block';
+
+    setTimeout(() => {
+        resultDiv.style.display = 'none';
+    }, 5000);
+}
@@ -0,0 +1,77 @@
+"""
+Team registry for NFL PickEm
+The 32 teams are reference data that never change while the app runs, so
+they are read from the `teams` table once at startup. Queries select team ids
+only; names, abbreviations and logo URLs are resolved here by indexing a
+tuple with the id instead of JOINing `teams` (often twice) per row.
+The registry also carries a content hash, so clients can cache the team list
+forever under a versioned URL and receive bare team ids everywhere else.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+LOGO_URL = "https://a.espncdn.com/i/teamlogos/nfl/500/{abbr}.png"
+
+
+class Team(NamedTuple):
+    id: int
+    name: str
+    abbr: str
+    logo_url: str
+
+
+class TeamRegistry:
+    """Immutable lookup tables built from (id, name, abbreviation, logo_url) rows"""
+
+    def __init__(self, rows):
+        teams = [
+            Team(team_id, name, abbr, logo_url or LOGO_URL.format(abbr=abbr.lower()))
+            for team_id, name, abbr, logo_url in sorted(rows)
+        ]
+        by_id = [None] * (max((team.id for team in teams), default=0) + 1)
+        for team in teams:
+            by_id[team.id] = team
+        self._by_id = tuple(by_id)
+        self._teams = tuple(teams)
+        self._by_name = {team.name: team for team in teams}
+        self._by_abbr = {team.abbr: team for team in teams}
+        self.version = hashlib.sha1(repr(self._teams).encode()).hexdigest()[:12]
+
+    @classmethod
+    def load(cls, cursor):
+        cursor.execute("SELECT id, name, abbreviation, logo_url FROM teams")
+        return cls(cursor.fetchall())
+
+    def __len__(self):
+        return len(self._teams)
+
+    def __iter__(self):
+        return iter(self._teams)
+
+    def get(self, team_id):
+        """Team by id, None for unknown ids"""
+        if team_id is None or not 0 <= team_id < len(self._by_id):
+            return None
+        return self._by_id[team_id]
+
+    def name(self, team_id, default=None):
+        team = self.get(team_id)
+        return team.name if team is not None else default
+
+    def by_name(self, name):
+        return self._by_name.get(name)
+
+    def by_abbr(self, abbr):
+        return self._by_abbr.get(abbr.upper())
+
+    def as_dicts(self):
+        return [{'id': team.id, 'name': team.name, 'abbr': team.abbr, 'logo_url': team.logo_url}
+                for team in self._teams]
+
+    def find(self, value):
+        """Team by id (as text), abbreviation or full name, None if nothing matches"""
+        value = str(value).strip()
+        if value.isdigit():
+            return self.get(int(value))
+        return self.by_abbr(value) or self.by_name(value)
@@ -0,0 +1,117 @@
+"""
+Players and roles for NFL PickEm
+Users and their admin flag live only in the `users` table. Logins and admin
+checks are single indexed lookups, so a league can grow to thousands of
+players without touching the code. Players are bulk-imported from a CSV file:
+
+    python -m users players.csv [db_path]
+
+The file has a `username` column and an optional `is_admin` column
+(1/0, true/false, ja/nein); without a header row every line is one username.
+"""
+
+import csv
+import sqlite3
+import sys
+import time
+
+# Above this many players the login page asks for the name instead of listing everyone
+LOGIN_DROPDOWN_LIMIT = 50
+
+_TRUE_VALUES = {'1', 'true', 'yes', 'ja', 'x', 'admin'}
+
+FIND_USER_SQL = "SELECT id, username, is_admin FROM users WHERE username = ?"
+
+IS_ADMIN_SQL = "SELECT is_admin FROM users WHERE id = ?"
+
+
+def find_user(cursor, username):
+    """(id, username, is_admin) for a username, None if unknown"""
+    cursor.execute(FIND_USER_SQL, (username,))
+    return cursor.fetchone()
+
+
+def user_is_admin(cursor, user_id):
+    cursor.execute(IS_ADMIN_SQL, (user_id,))
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def login_choices(cursor, limit=LOGIN_DROPDOWN_LIMIT):
+    """Usernames for the login dropdown, None when the league is too big to list"""
+    cursor.execute("SELECT username FROM users ORDER BY id LIMIT ?", (limit + 1,))
+    usernames = [row[0] for row in cursor.fetchall()]
+    return usernames if len(usernames) <= limit else None
+
+
+def read_users_csv(path):
+    """[(username, is_admin or None)] from a CSV file; None keeps the current flag"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = [row for row in csv.reader(f) if row and row[0].strip()]
+    if rows and rows[0][0].strip().lower() == 'username':
+        header = [column.strip().lower() for column in rows.pop(0)]
+        admin_column = header.index('is_admin') if 'is_admin' in header else None
+    else:
+        admin_column = None
+
+    users = []
+    for row in rows:
+        flag = None
+        if admin_column is not None and admin_column < len(row):
+            flag = int(row[admin_column].strip().lower() in _TRUE_VALUES)
+        users.append((row[0].strip(), flag))
+    return users
+
+
+def import_users(cursor, users):
+    """Insert new players and update admin flags in one pass; returns (created, updated)"""
+    cursor.execute("SELECT COUNT(*) FROM users")
+    before = cursor.fetchone()[0]
+    changes = cursor.connection.total_changes
+
+    cursor.executemany("""
+        INSERT INTO users (username, is_admin) VALUES (:username, COALESCE(:is_admin, 0))
+        ON CONFLICT (username) DO UPDATE SET is_admin = COALESCE(:is_admin, is_admin)
+    """, [{'username': username, 'is_admin': is_admin} for username, is_admin in users])
+    touched = cursor.connection.total_changes - changes
+
+    # New players start with an empty standings row and no blocked teams
+    cursor.execute("INSERT OR IGNORE INTO standings (user_id) SELECT id FROM users")
+    cursor.execute("INSERT OR IGNORE INTO team_eligibility (user_id) SELECT id FROM users")
+
+    cursor.execute("SELECT COUNT(*) FROM users")
+    created = cursor.fetchone()[0] - before
+    return created, touched - created
+
+
+def main(argv):
+    if not argv:
+        print(__doc__)
+        return 1
+    csv_path = argv[0]
+    db_path = argv[1] if len(argv) > 1 else 'nfl_pickem.db'
+
+    from data_version import DataVersions
+    from migrations import migrate
+
+    started = time.perf_counter()
+    users = read_users_csv(csv_path)
+
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    created, updated = import_users(cursor, users)
+    conn.commit()
+    conn.close()
+
+    # Leaderboards and ETags of running workers pick up the new players
+    DataVersions(db_path + '-version').reset()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"✅ {created} players created, {updated} updated ({len(users)} rows) in {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))